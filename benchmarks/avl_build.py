@@ -0,0 +1,64 @@
+"""
+AVLTree: construção e atualização pelos caminhos iterativos (insert/remove com
+pilha explícita e parada antecipada, from_sorted em O(n)) comparados aos
+caminhos recursivos _insert_recursive/_remove.
+
+Uso: python benchmarks/avl_build.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.avl import AVLTree
+
+
+class RecursiveAVLTree(AVLTree):
+    """Os caminhos recursivos originais."""
+    def insert(self, value):
+        self.root = self._insert_recursive(self.root, value)
+
+    def remove(self, value):
+        if self.root:
+            self.root = self._remove(self.root, value)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def fill(tree, keys):
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def main(n=200_000):
+    sorted_keys = list(range(n))
+    random_keys = random.Random(0).sample(range(10 * n), n)
+    print(f"n = {n:,}")
+    print(f"{'cenário':<28} {'recursivo':>10} {'iterativo':>10} {'from_sorted':>12}")
+
+    rec, it = RecursiveAVLTree(), AVLTree()
+    row = [timed(lambda: fill(rec, sorted_keys)), timed(lambda: fill(it, sorted_keys))]
+    built = []
+    row.append(timed(lambda: built.append(AVLTree.from_sorted(sorted_keys))))
+    assert list(rec) == list(it) == list(built[0]) == sorted_keys
+    print(f"{'inserção em ordem':<28} {row[0]:>10.2f} {row[1]:>10.2f} {row[2]:>12.2f}")
+
+    rec, it = RecursiveAVLTree(), AVLTree()
+    row = [timed(lambda: fill(rec, random_keys)), timed(lambda: fill(it, random_keys))]
+    print(f"{'inserção aleatória':<28} {row[0]:>10.2f} {row[1]:>10.2f}")
+
+    victims = random_keys[::2]
+    row = [timed(lambda: [rec.remove(k) for k in victims]), timed(lambda: [it.remove(k) for k in victims])]
+    assert list(rec) == list(it) == sorted(random_keys[1::2])
+    print(f"{'remoção aleatória':<28} {row[0]:>10.2f} {row[1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,54 @@
+"""
+União de duas AVLTrees: inserir os valores de uma na outra, um a um,
+comparado a union() (join/split) sequencial e com um pool de processos.
+
+Uso: python benchmarks/avl_set_ops.py [n]
+"""
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.avl import AVLTree
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(n=200_000):
+    rnd = random.Random(0)
+    a_keys = sorted(rnd.sample(range(10 * n), n))
+    b_keys = sorted(rnd.sample(range(10 * n), n))
+    expected = sorted(set(a_keys) | set(b_keys))
+    print(f"CPUs: {os.cpu_count()}  n = {n:,} + {n:,}")
+
+    def one_by_one():
+        a = AVLTree.from_sorted(a_keys)
+        for key in b_keys:
+            a.insert(key)
+        return a
+
+    base, elapsed = timed(one_by_one)
+    assert list(base) == expected
+    print(f"{'inserção um a um':<24} {elapsed:>8.2f}s")
+
+    merged, elapsed = timed(lambda: AVLTree.from_sorted(a_keys).union(AVLTree.from_sorted(b_keys)))
+    assert list(merged) == expected
+    print(f"{'union sequencial':<24} {elapsed:>8.2f}s")
+
+    for workers in (2, 4):
+        with ProcessPoolExecutor(workers) as pool:
+            merged, elapsed = timed(lambda: AVLTree.from_sorted(a_keys).union(
+                AVLTree.from_sorted(b_keys), executor=pool, cutoff=2 * n // (4 * workers)))
+        assert list(merged) == expected
+        print(f"{f'union, {workers} processos':<24} {elapsed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,94 @@
+"""
+Teste de estresse da ConcurrentBPlusTree (latch crabbing) comparado a uma
+BPlusTree comum protegida por um único lock global.
+
+Cada thread escritora mexe apenas em chaves próprias (k % threads == id), então
+o conteúdo final esperado é conhecido; no fim a árvore passa por check_invariants().
+
+Uso: python benchmarks/bplus_concurrency.py [ops_por_thread]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.b_plus import BPlusTree
+from src.b_plus_concurrent import ConcurrentBPlusTree
+
+
+class GlobalLockTree:
+    """BPlusTree atrás de um lock único (a alternativa atual)."""
+    def __init__(self, order):
+        self.tree = BPlusTree(order)
+        self.lock = threading.Lock()
+
+    def insert(self, key, value=None):
+        with self.lock:
+            self.tree.insert(key, value)
+
+    def remove(self, key):
+        with self.lock:
+            self.tree.remove(key)
+
+    def get(self, key):
+        with self.lock:
+            return self.tree.get(key)
+
+    def range(self, lo, hi, limit):
+        with self.lock:
+            return list(self.tree.range(lo, hi, limit=limit))
+
+
+def run(tree, threads, ops, key_space, read_ratio):
+    expected = [set() for _ in range(threads)]
+
+    def worker(wid):
+        rnd = random.Random(wid)
+        mine = expected[wid]
+        for _ in range(ops):
+            key = rnd.randrange(key_space) * threads + wid
+            r = rnd.random()
+            if r < read_ratio:
+                tree.get(key)
+            elif r < read_ratio + 0.02:
+                list(tree.range(key, None, limit=20))
+            elif key in mine and r > 0.8:
+                tree.remove(key)
+                mine.discard(key)
+            else:
+                tree.insert(key, wid)
+                mine.add(key)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return threads * ops / elapsed, set().union(*expected)
+
+
+def main(ops=20_000):
+    order, key_space = 32, 5_000
+    print(f"{'threads':>8} {'leituras':>9} {'lock global':>13} {'crabbing':>13}")
+    for threads in (1, 2, 4, 8):
+        for read_ratio in (0.5, 0.9):
+            locked = GlobalLockTree(order)
+            locked_rate, expected = run(locked, threads, ops, key_space, read_ratio)
+            assert list(locked.tree) == sorted(expected)
+
+            crabbing = ConcurrentBPlusTree(order)
+            crabbing_rate, expected = run(crabbing, threads, ops, key_space, read_ratio)
+            crabbing.check_invariants()
+            assert list(crabbing) == sorted(expected), "conteúdo final divergente"
+
+            print(f"{threads:>8} {read_ratio:>9.0%} {locked_rate:>13,.0f} {crabbing_rate:>13,.0f}")
+    print("invariantes ok")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
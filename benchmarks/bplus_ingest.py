@@ -0,0 +1,37 @@
+"""
+Vazão de ingestão: BPlusTree.insert chave a chave vs. BufferedBPlusTree (lotes).
+
+Uso: python benchmarks/bplus_ingest.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.b_plus import BPlusTree, BufferedBPlusTree
+
+
+def ingest(tree, keys):
+    start = time.perf_counter()
+    for key in keys:
+        tree.insert(key, key)
+    if isinstance(tree, BufferedBPlusTree):
+        tree.flush_buffer()
+    return len(keys) / (time.perf_counter() - start)
+
+
+def main(n=200_000):
+    keys = random.sample(range(n * 10), n)
+    print(f"n={n}  (inserções por segundo)")
+    print(f"{'ordem':>6} {'insert':>12} {'buffer=1k':>12} {'buffer=16k':>12}")
+    for order in (16, 64, 256):
+        plain = ingest(BPlusTree(order), keys)
+        small = ingest(BufferedBPlusTree(order, buffer_size=1024), keys)
+        large = ingest(BufferedBPlusTree(order, buffer_size=16384), keys)
+        print(f"{order:>6} {plain:>12,.0f} {small:>12,.0f} {large:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
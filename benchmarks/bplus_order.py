@@ -0,0 +1,36 @@
+"""
+Custo por operação da BPlusTree conforme a ordem cresce.
+
+Uso: python benchmarks/bplus_order.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.b_plus import BPlusTree
+
+
+def per_op(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main(n=100_000):
+    keys = random.sample(range(n * 10), n)
+    print(f"n={n}  (µs por operação)")
+    print(f"{'ordem':>6} {'insert':>8} {'search':>8} {'remove':>8}")
+    for order in (4, 16, 64, 128, 256, 512):
+        tree = BPlusTree(order)
+        t_insert = per_op(tree.insert, keys)
+        t_search = per_op(tree.search, keys)
+        t_remove = per_op(tree.remove, keys)
+        print(f"{order:>6} {t_insert:>8.2f} {t_search:>8.2f} {t_remove:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,52 @@
+"""
+FrozenTree: buscas na AVLTree (ponteiros entre objetos Node) comparadas às
+da árvore congelada em layout de Eytzinger e de van Emde Boas, uma a uma e
+em lote (search_many, vetorizado), com np.searchsorted como referência.
+
+Uso: python benchmarks/frozen_tree.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.avl import AVLTree
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(n=1_000_000, queries=200_000):
+    keys = sorted(random.Random(0).sample(range(10 * n), n))
+    tree = AVLTree.from_sorted(keys)
+    probes = random.Random(1).choices(range(10 * n), k=queries)
+    batch = np.array(probes, dtype=np.int64)
+    print(f"n = {n:,}, {queries:,} consultas")
+
+    t, expected = timed(lambda: [tree.search(q) is not None for q in probes])
+    print(f"{'AVLTree.search (uma a uma)':<36} {t:>8.3f}s")
+    expected = np.array(expected)
+    sorted_keys = np.array(keys, dtype=np.int64)
+    t, _ = timed(lambda: np.searchsorted(sorted_keys, batch))
+    print(f"{'np.searchsorted (referência)':<36} {t:>8.3f}s")
+
+    for layout in ("eytzinger", "veb"):
+        t, frozen = timed(lambda: tree.freeze(layout))
+        print(f"freeze('{layout}'): {t:.2f}s")
+        t, found = timed(lambda: [frozen.search(q) for q in probes])
+        assert found == expected.tolist()
+        print(f"{'  search (uma a uma)':<36} {t:>8.3f}s")
+        t, found = timed(lambda: frozen.search_many(batch))
+        assert (found == expected).all()
+        print(f"{'  search_many (lote)':<36} {t:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,85 @@
+"""
+Memória por entrada e operações por segundo: HashTable (encadeamento) vs.
+OpenAddressingHashTable (Robin Hood em arrays paralelos).
+
+Uso: python benchmarks/hash_tables.py [n]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.hash_table import HashTable, OpenAddressingHashTable
+from src.int_hash_table import IntHashTable
+
+
+def memory_per_entry(factory, keys):
+    # Os inteiros das chaves já existem: só a estrutura da tabela é contada
+    tracemalloc.start()
+    table = factory()
+    for key in keys:
+        table.insert(key, key)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory / len(keys)
+
+
+def measure(factory, keys, misses):
+    table = factory()
+    start = time.perf_counter()
+    for key in keys:
+        table.insert(key, key)
+    t_insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        table.search(key)
+    t_hit = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in misses:
+        table.search(key)
+    t_miss = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        table.remove(key)
+    t_remove = time.perf_counter() - start
+
+    n = len(keys)
+    return memory_per_entry(factory, keys), n / t_insert, n / t_hit, len(misses) / t_miss, n / t_remove
+
+
+def main(n=200_000):
+    keys = random.sample(range(n * 10), n)
+    present = set(keys)
+    misses = [k for k in range(n * 10, n * 11)][:n]
+    assert not present.intersection(misses)
+    print(f"n={n}")
+    print(f"{'tabela':>16} {'bytes/entrada':>14} {'insert/s':>11} {'hit/s':>11} {'miss/s':>11} {'remove/s':>11}")
+    for name, factory in (("encadeada", HashTable), ("robin hood", OpenAddressingHashTable)):
+        mem, ins, hit, miss, rem = measure(factory, keys, misses)
+        print(f"{name:>16} {mem:>14.1f} {ins:>11,.0f} {hit:>11,.0f} {miss:>11,.0f} {rem:>11,.0f}")
+
+    # Lotes vetorizados (IntHashTable): o mesmo conjunto de chaves de uma vez
+    table = IntHashTable()
+    start = time.perf_counter()
+    table.insert_many(keys, keys)
+    t_insert = time.perf_counter() - start
+    start = time.perf_counter()
+    table.search_many(keys)
+    t_hit = time.perf_counter() - start
+    start = time.perf_counter()
+    table.search_many(misses)
+    t_miss = time.perf_counter() - start
+    start = time.perf_counter()
+    table.remove_many(keys)
+    t_remove = time.perf_counter() - start
+    mem = table.keys.nbytes + table.values.nbytes + table.state.nbytes
+    print(f"{'numpy (lotes)':>16} {mem / n:>14.1f} {n / t_insert:>11,.0f} {n / t_hit:>11,.0f} "
+          f"{len(misses) / t_miss:>11,.0f} {n / t_remove:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,75 @@
+"""
+Vazão da SharedHashTable (shards em memória compartilhada) conforme o número
+de processos trabalhadores.
+
+Cada processo insere e busca chaves próprias (k % processos == id); no fim o
+processo principal confere o conteúdo da tabela.
+
+Uso: python benchmarks/shared_hash_table.py [ops_por_processo]
+"""
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared_hash_table import SharedHashTable
+
+
+def worker(table, wid, workers, ops, start_event):
+    rnd = random.Random(wid)
+    start_event.wait()
+    for i in range(ops):
+        key = i * workers + wid
+        if rnd.random() < 0.5:
+            table.insert(key, key * 2)
+        else:
+            table.search(rnd.randrange(ops) * workers + wid)
+    table.close()
+
+
+def run(ctx, workers, shards, ops):
+    table = SharedHashTable(shards=shards, slots_per_shard=2 * workers * ops // shards,
+                            mp_context=ctx)
+    start_event = ctx.Event()
+    procs = [ctx.Process(target=worker, args=(table, wid, workers, ops, start_event))
+             for wid in range(workers)]
+    for p in procs:
+        p.start()
+    begin = time.perf_counter()
+    start_event.set()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - begin
+
+    # Mesma sequência aleatória dos trabalhadores: sabemos quais chaves foram inseridas
+    expected = 0
+    for wid in range(workers):
+        rnd = random.Random(wid)
+        for i in range(ops):
+            if rnd.random() < 0.5:
+                expected += 1
+                key = i * workers + wid
+                assert table.search(key) == key * 2, "valor divergente"
+            else:
+                rnd.randrange(ops)
+    assert len(table) == expected, "tamanho divergente"
+    table.unlink()
+    return workers * ops / elapsed
+
+
+def main(ops=50_000):
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'processos':>10} {'1 shard':>12} {'16 shards':>12}")
+    for workers in (1, 2, 4, 8):
+        single = run(ctx, workers, 1, ops)
+        sharded = run(ctx, workers, 16, ops)
+        print(f"{workers:>10} {single:>12,.0f} {sharded:>12,.0f}")
+    print("conteúdo ok")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,60 @@
+"""
+Construção da FrozenTrie: FrozenTrie.from_words (serial) comparada a
+FrozenTrie.build_parallel, que separa as palavras pelo primeiro caractere,
+monta as partes em um pool de processos e as intercala nível a nível. A
+inserção na Trie comum aparece como referência, ao lado de Trie.build_parallel,
+que recria a FrozenTrie paralela como nós da Trie.
+
+Uso: python benchmarks/trie_parallel.py [n_palavras]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tries import FrozenTrie, Trie
+
+
+def random_words(n, seed=0):
+    rnd = random.Random(seed)
+    letters = string.ascii_lowercase
+    return ["".join(rnd.choices(letters, k=rnd.randint(3, 12))) for _ in range(n)]
+
+
+def timed(build):
+    start = time.perf_counter()
+    trie = build()
+    return trie, time.perf_counter() - start
+
+
+def main(n=300_000):
+    words = random_words(n)
+    print(f"CPUs: {os.cpu_count()}  palavras: {n:,}")
+
+    def insertion():
+        trie = Trie()
+        for word in words:
+            trie.insert(word)
+        return trie
+
+    sequential, elapsed = timed(insertion)
+    print(f"Trie.insert, uma a uma: {elapsed:.2f}s")
+    trie, elapsed = timed(lambda: Trie.build_parallel(words))
+    assert list(trie) == list(sequential) and trie.complete("ab") == sequential.complete("ab"), "conteúdo divergente"
+    print(f"Trie.build_parallel ({os.cpu_count()} processos): {elapsed:.2f}s")
+    del sequential, trie
+    reference, base = timed(lambda: FrozenTrie.from_words(words))
+    print(f"{'processos':>10} {'tempo (s)':>10} {'speedup':>8}")
+    print(f"{'serial':>10} {base:>10.2f} {1.0:>8.2f}")
+    for processes in (1, 2, 4, 8):
+        frozen, elapsed = timed(lambda: FrozenTrie.build_parallel(words, processes=processes))
+        assert frozen.labels == reference.labels and frozen.first_child == reference.first_child, "conteúdo divergente"
+        print(f"{processes:>10} {elapsed:>10.2f} {base / elapsed:>8.2f}")
+    print("conteúdo ok")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
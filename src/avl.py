@@ -1,43 +1,374 @@
-from .bst import BinaryTree, Node, ROOT
+from .bst import BinarySearchTree, Node, ROOT
 
-class AVLTree(BinaryTree):
+class AVLTree(BinarySearchTree):
   def get_height(self, node):
     if not node:
       return 0
     return node.height
 
+  def get_size(self, node):
+    if not node:
+      return 0
+    return node.size
+
+  def _update(self, node):
+    node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
+    node.size = 1 + self.get_size(node.left) + self.get_size(node.right)
+
   def get_balance(self, node):
     if not node:
       return 0
     return self.get_height(node.left) - self.get_height(node.right)
 
   def right_rotate(self, y):
+    if self.persistent: # Os dois nós alterados podem estar em outras versões
+      y = y.copy()
+      y.left = y.left.copy()
     x = y.left
     T2 = x.right
     x.right = y
     y.left = T2
-    y.height = 1 + max(self.get_height(y.left), self.get_height(y.right))
-    x.height = 1 + max(self.get_height(x.left), self.get_height(x.right))
+    self._update(y)
+    self._update(x)
 
     # Retorna o novo nó raiz dessa sub-árvore
     return x
 
   def left_rotate(self, x):
+    if self.persistent:
+      x = x.copy()
+      x.right = x.right.copy()
     y = x.right
     T2 = y.left
     y.left = x
     x.right = T2
-    x.height = 1 + max(self.get_height(x.left), self.get_height(x.right))
-    y.height = 1 + max(self.get_height(y.left), self.get_height(y.right))
+    self._update(x)
+    self._update(y)
 
     # Retorna o novo nó raiz da subarvore
     return y
 
+  @classmethod
+  def from_sorted(cls, values, persistent=False):
+    """
+    Monta uma árvore perfeitamente balanceada a partir de valores em ordem
+    crescente (repetidos são ignorados), em O(n) e sem rotações: o elemento
+    do meio vira a raiz e cada metade vira uma subárvore.
+    """
+    items = []
+    for value in values:
+      if items and value <= items[-1]:
+        if value == items[-1]:
+          continue
+        raise ValueError(f"Entrada fora de ordem: {value!r} depois de {items[-1]!r}")
+      items.append(value)
+    tree = cls(persistent=persistent)
+    tree.root = tree._build_balanced(items, 0, len(items))
+    tree.size = len(items)
+    return tree
+
+  def _build_balanced(self, items, lo, hi):
+    # A profundidade da recursão é log2(n)
+    if lo >= hi:
+      return None
+    mid = (lo + hi) // 2
+    node = Node(items[mid])
+    node.left = self._build_balanced(items, lo, mid)
+    node.right = self._build_balanced(items, mid + 1, hi)
+    self._update(node)
+    return node
+
   def insert(self, value):
-    self.root = self._insert_recursive(self.root, value)
+    # Iterativo: desce guardando o caminho e rebalanceia na volta
+    path = []
+    node = self.root
+    while node:
+      if value == node.data:
+        return
+      path.append(node)
+      node = node.left if value < node.data else node.right
+    new = Node(value)
+    self.size += 1
+    if not path:
+      self.root = new
+      return
+    if self.persistent:
+      path = self._copy_path(path)
+    if value < path[-1].data:
+      path[-1].left = new
+    else:
+      path[-1].right = new
+    # Tamanhos antes das alturas: o retrace pode parar no meio do caminho
+    for node in path:
+      node.size += 1
+    # A raiz só é trocada com a versão pronta (leitores de snapshot() nunca
+    # veem um caminho pela metade)
+    self.root = self._retrace(path, inserting=True)
+
+  def _retrace(self, path, inserting):
+    """
+    Sobe pelo caminho atualizando alturas e rotacionando onde o fator de
+    balanceamento passar de 1. Para assim que a altura de uma subárvore não
+    muda (nada acima dela muda); na inserção, uma rotação já restaura a
+    altura anterior. Devolve a raiz do caminho (que muda se houver rotação
+    no topo).
+    """
+    root = path[0]
+    for i in range(len(path) - 1, -1, -1):
+      node = path[i]
+      old_height = node.height
+      node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
+      balance = self.get_balance(node)
+      if balance > 1 or balance < -1:
+        subtree = self._rebalance(node, balance)
+        parent = path[i - 1] if i else None
+        if parent is None:
+          root = subtree
+        elif parent.left is node:
+          parent.left = subtree
+        else:
+          parent.right = subtree
+        if inserting or subtree.height == old_height:
+          return root
+      elif node.height == old_height:
+        return root
+    return root
+
+  def _rebalance(self, node, balance):
+    if balance > 1:
+      if self.get_balance(node.left) < 0: # Esquerda Direita
+        node.left = self.left_rotate(node.left)
+      return self.right_rotate(node)
+    if self.get_balance(node.right) > 0: # Direita Esquerda
+      node.right = self.right_rotate(node.right)
+    return self.left_rotate(node)
+
+  # Estatísticas de ordem: usam o tamanho das subárvores, O(log n)
+  def rank(self, value):
+    """Quantidade de valores menores que 'value'."""
+    return self._rank(value, inclusive=False)
+
+  def _rank(self, value, inclusive):
+    rank = 0
+    node = self.root
+    while node:
+      if value < node.data or (not inclusive and value == node.data):
+        node = node.left
+      else:
+        rank += self.get_size(node.left) + 1
+        node = node.right
+    return rank
+
+  def select(self, i):
+    """O i-ésimo menor valor (a partir de 0; negativos contam do fim, como em listas)."""
+    if i < 0:
+      i += self.size
+    if not 0 <= i < self.size:
+      raise IndexError("índice fora da árvore")
+    node = self.root
+    while True:
+      left = self.get_size(node.left)
+      if i < left:
+        node = node.left
+      elif i == left:
+        return node.data
+      else:
+        i -= left + 1
+        node = node.right
+
+  def count_range(self, lo, hi):
+    """Quantidade de valores v com lo <= v <= hi."""
+    if hi < lo:
+      return 0
+    return self._rank(hi, inclusive=True) - self._rank(lo, inclusive=False)
+
+  def median(self):
+    """Mediana inferior (o elemento do meio; com tamanho par, o menor dos dois)."""
+    if not self.size:
+      raise ValueError("árvore vazia")
+    return self.select((self.size - 1) // 2)
+
+  # Operações de conjunto baseadas em join/split. Reaproveitam os nós das
+  # árvores de entrada, que são consumidas (ficam vazias); use copy() antes
+  # se ainda precisar delas. Árvores persistentes não são consumidas: o
+  # resultado copia os caminhos que alteraria.
+  def copy(self):
+    if self.persistent:
+      return self.snapshot()
+    return type(self).from_sorted(self)
+
+  def split(self, value):
+    """
+    Divide a árvore em (menores, encontrado, maiores): duas AVLTrees com os
+    valores < value e > value, e se value estava presente. O(log n).
+    """
+    left, found, right = self._split(self.root, value)
+    if not self.persistent:
+      self.root = None
+      self.size = 0
+    return self._wrap(left), found, self._wrap(right)
+
+  @classmethod
+  def join(cls, left, value, right):
+    """
+    Junta left, value e right (todos os valores de left < value < todos os de
+    right) em uma nova árvore, em O(|altura(left) - altura(right)| + 1).
+    """
+    if (left.root and left.max() >= value) or (right.root and right.min() <= value):
+      raise ValueError("join exige max(left) < value < min(right)")
+    tree = cls(persistent=left.persistent or right.persistent)
+    root = tree._join(left.root, Node(value), right.root)
+    for source in (left, right):
+      if not source.persistent:
+        source.root = None
+        source.size = 0
+    return tree._wrap(root)
+
+  def union(self, other, executor=None, cutoff=50_000):
+    """
+    Valores presentes em qualquer uma das árvores, em O(m log(n/m + 1)).
+    Com um executor (ThreadPoolExecutor ou ProcessPoolExecutor), subproblemas
+    com mais de 'cutoff' nós são divididos e os pedaços menores rodam no pool.
+    """
+    return self._combine("union", other, executor, cutoff)
+
+  def intersection(self, other, executor=None, cutoff=50_000):
+    """Valores presentes nas duas árvores (mesmos parâmetros de union)."""
+    return self._combine("intersection", other, executor, cutoff)
+
+  def difference(self, other, executor=None, cutoff=50_000):
+    """Valores desta árvore que não estão em other (mesmos parâmetros de union)."""
+    return self._combine("difference", other, executor, cutoff)
+
+  def _combine(self, op, other, executor, cutoff):
+    a, b = self.root, other.root
+    # Se alguma das árvores é persistente, o resultado também é (não altera nós)
+    tree = type(self)(persistent=self.persistent or other.persistent)
+    for source in (self, other):
+      if not source.persistent:
+        source.root = None
+        source.size = 0
+    if a is b: # A árvore com ela mesma
+      return tree._wrap(None if op == "difference" else a)
+    if executor is None:
+      root = tree._set_op(op, a, b)
+    else:
+      root = tree._collect(op, tree._set_op_parallel(op, a, b, executor, cutoff))
+    return tree._wrap(root)
+
+  def _wrap(self, root):
+    tree = type(self)(persistent=self.persistent)
+    tree.root = root
+    tree.size = self.get_size(root)
+    return tree
+
+  def _set_op(self, op, a, b):
+    if a is None or b is None:
+      if op == "union":
+        return a if a is not None else b
+      return None if op == "intersection" else a
+    # Divide b pela raiz de a e resolve as duas metades independentemente
+    left_b, found, right_b = self._split(b, a.data)
+    left = self._set_op(op, a.left, left_b)
+    right = self._set_op(op, a.right, right_b)
+    return self._merge(op, left, a, found, right)
+
+  def _merge(self, op, left, node, found, right):
+    if op == "union" or (op == "intersection" and found) or (op == "difference" and not found):
+      return self._join(left, node, right)
+    return self._join2(left, right)
+
+  def _set_op_parallel(self, op, a, b, executor, cutoff):
+    # Devolve um plano: um Future (subproblema pequeno, enviado ao pool) ou a
+    # tupla (plano esquerdo, nó, encontrado, plano direito) a ser juntada depois
+    if a is None or b is None or a.size + b.size <= cutoff:
+      return executor.submit(_set_operation, type(self), self.persistent, op, a, b)
+    left_b, found, right_b = self._split(b, a.data)
+    left = self._set_op_parallel(op, a.left, left_b, executor, cutoff)
+    right = self._set_op_parallel(op, a.right, right_b, executor, cutoff)
+    return (left, a, found, right)
+
+  def _collect(self, op, plan):
+    if not isinstance(plan, tuple):
+      return plan.result()
+    left, node, found, right = plan
+    return self._merge(op, self._collect(op, left), node, found, self._collect(op, right))
+
+  def _split(self, node, value):
+    if node is None:
+      return None, False, None
+    if value == node.data:
+      return node.left, True, node.right
+    if value < node.data:
+      left, found, right = self._split(node.left, value)
+      return left, found, self._join(right, node, node.right)
+    left, found, right = self._split(node.right, value)
+    return self._join(node.left, node, left), found, right
+
+  def _join(self, left, node, right):
+    """Junta left, node e right reaproveitando 'node' como separador."""
+    if self.persistent:
+      node = node.copy()
+    hl, hr = self.get_height(left), self.get_height(right)
+    if hl > hr + 1:
+      # left é mais alta: desce pela espinha direita até a altura de right
+      path = []
+      spine = left
+      while self.get_height(spine) > hr + 1:
+        path.append(spine)
+        spine = spine.right
+      if self.persistent:
+        path = self._copy_path(path)
+      node.left, node.right = spine, right
+      self._update(node)
+      path[-1].right = node
+      return self._repair_spine(path, right_side=True)
+    if hr > hl + 1:
+      path = []
+      spine = right
+      while self.get_height(spine) > hl + 1:
+        path.append(spine)
+        spine = spine.left
+      if self.persistent:
+        path = self._copy_path(path)
+      node.left, node.right = left, spine
+      self._update(node)
+      path[-1].left = node
+      return self._repair_spine(path, right_side=False)
+    node.left, node.right = left, right
+    self._update(node)
+    return node
+
+  def _repair_spine(self, path, right_side):
+    # Refaz alturas e tamanhos de baixo para cima, rotacionando onde preciso
+    for i in range(len(path) - 1, -1, -1):
+      node = path[i]
+      self._update(node)
+      balance = self.get_balance(node)
+      if balance > 1 or balance < -1:
+        node = path[i] = self._rebalance(node, balance)
+        if i and right_side:
+          path[i - 1].right = node
+        elif i:
+          path[i - 1].left = node
+    return path[0]
+
+  def _join2(self, left, right):
+    # Junta sem separador: o maior valor de left vira o separador
+    if left is None:
+      return right
+    rest, last = self._split_last(left)
+    return self._join(rest, last, right)
+
+  def _split_last(self, node):
+    if node.right is None:
+      return node.left, node
+    rest, last = self._split_last(node.right)
+    return self._join(node.left, node, rest), last
 
   def _insert_recursive(self, node, value):
     if not node:
+      self.size += 1
       return Node(value) # height=1
     elif value < node.data:
       node.left = self._insert_recursive(node.left, value)
@@ -46,7 +377,7 @@ class AVLTree(BinaryTree):
     else:
       return node
 
-    node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
+    self._update(node)
     # Obtém o fator de balanceamento
     balance = self.get_balance(node)
 
@@ -83,9 +414,43 @@ class AVLTree(BinaryTree):
           return current
 
   def remove(self, value):
-      # Chama a função recursiva e ATUALIZA a raiz da árvore
-      if self.root:
-          self.root = self._remove(self.root, value)
+    # Iterativo, com o mesmo caminho explícito da inserção
+    path = []
+    node = self.root
+    while node and node.data != value:
+      path.append(node)
+      node = node.left if value < node.data else node.right
+    if node is None:
+      return
+
+    # Caso 3: Nó com dois filhos. Copia o sucessor in-order e remove o sucessor
+    successor = node
+    if node.left and node.right:
+      depth = len(path)
+      path.append(node)
+      successor = node.right
+      while successor.left:
+        path.append(successor)
+        successor = successor.left
+    if self.persistent and path:
+      path = self._copy_path(path)
+    if successor is not node:
+      path[depth].data = successor.data
+      node = successor
+
+    # Caso 1 ou 2: Nó com um filho ou nenhum
+    child = node.left if node.left else node.right
+    if not path:
+      self.root = child
+    elif path[-1].left is node:
+      path[-1].left = child
+    else:
+      path[-1].right = child
+    self.size -= 1
+    for ancestor in path:
+      ancestor.size -= 1
+    if path:
+      self.root = self._retrace(path, inserting=False)
 
   def _remove(self, node, value):
       if not node:
@@ -99,10 +464,12 @@ class AVLTree(BinaryTree):
           
           # Caso 1 ou 2: Nó com um filho ou nenhum
           if node.left is None:
+              self.size -= 1
               temp = node.right
               node = None
               return temp
           elif node.right is None:
+              self.size -= 1
               temp = node.left
               node = None
               return temp
@@ -116,7 +483,7 @@ class AVLTree(BinaryTree):
 
       if node is None:
           return node
-      node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
+      self._update(node)
 
       balance = self.get_balance(node)
 
@@ -138,4 +505,8 @@ class AVLTree(BinaryTree):
           node.right = self.right_rotate(node.right)
           return self.left_rotate(node)
 
-      return node
\ No newline at end of file
+      return node
+
+def _set_operation(tree_class, persistent, op, a, b):
+  # Executada no pool (função de módulo para poder ser enviada a outro processo)
+  return tree_class(persistent=persistent)._set_op(op, a, b)
@@ -1,4 +1,7 @@
 import math
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
 
 class BPlusNode:
     def __init__(self, order):
@@ -7,128 +10,510 @@ class BPlusNode:
         self.children = []
         self.is_leaf = False 
         self.next = None 
-        self.parent = None
+        self.prev = None # Folhas são duplamente encadeadas (iteração reversa)
 
     def is_underflow(self):
         min_keys = math.ceil(self.order / 2) - 1
         return len(self.keys) < min_keys
 
+def _split_tail(items, max_size):
+    """O que sobrou de um nível: um grupo, ou duas metades se não couber em um."""
+    if len(items) <= max_size:
+        return [items] if items else []
+    half = len(items) // 2
+    return [items[:half], items[half:]]
+
+class _BulkBuilder:
+    """
+    Monta a árvore de baixo para cima a partir de pares (chave, valor) em ordem
+    crescente, recebidos um a um. Uma folha é criada assim que há entradas para
+    duas, e um pai assim que há filhos para dois: sobram sempre entradas para
+    pelo menos uma página cheia, então o fim de cada nível (finish) é fechado em
+    uma ou duas páginas sem ficar abaixo do mínimo. Além da árvore, só ficam em
+    memória as entradas ainda sem página: menos de duas páginas por nível.
+    """
+    def __init__(self, tree, per_leaf, per_node):
+        self.tree = tree
+        self.per_leaf = per_leaf
+        self.per_node = per_node
+        self.items = [] # Pares que ainda não estão em uma folha
+        self.levels = [] # levels[i]: (menor chave, ref) dos nós do nível i ainda sem pai
+        self.first_leaf = None
+        self.prev = None
+
+    def add(self, item):
+        # Chave repetida (a entrada está em ordem): vale o último valor
+        if self.items and item[0] == self.items[-1][0]:
+            self.items[-1] = item
+            return
+        self.items.append(item)
+        if len(self.items) >= 2 * self.per_leaf:
+            self._leaf(self.items[:self.per_leaf])
+            del self.items[:self.per_leaf]
+
+    def _leaf(self, group):
+        tree = self.tree
+        leaf = tree._new_node(True)
+        leaf.keys.extend(key for key, _ in group)
+        leaf.children.extend(value for _, value in group)
+        if self.prev is None:
+            self.first_leaf = tree._ref(leaf)
+        else:
+            self.prev.next = tree._ref(leaf)
+            leaf.prev = tree._ref(self.prev)
+            tree._dirty(self.prev)
+        tree._dirty(leaf)
+        self.prev = leaf
+        self._push(0, (group[0][0], tree._ref(leaf)))
+
+    def _push(self, i, entry):
+        if i == len(self.levels):
+            self.levels.append([])
+        pending = self.levels[i]
+        pending.append(entry)
+        if len(pending) >= 2 * self.per_node:
+            self._parent(i, pending[:self.per_node])
+            del pending[:self.per_node]
+
+    def _parent(self, i, group):
+        # Os separadores são a menor chave de cada filho (exceto o primeiro)
+        node = self.tree._new_node(False)
+        node.keys = [first for first, _ in group[1:]]
+        node.children = [child for _, child in group]
+        self.tree._dirty(node)
+        self._push(i + 1, (group[0][0], self.tree._ref(node)))
+
+    def finish(self):
+        """Fecha o fim de cada nível, de baixo para cima; devolve a ref da raiz."""
+        for group in _split_tail(self.items, self.tree.order - 1):
+            self._leaf(group)
+        self.items = []
+        i = 0
+        while True:
+            pending = self.levels[i]
+            if i == len(self.levels) - 1 and len(pending) == 1:
+                return pending[0][1]
+            self.levels[i] = []
+            for group in _split_tail(pending, self.tree.order):
+                self._parent(i, group)
+            i += 1
+
+    def discard(self):
+        """Desfaz a montagem: libera as páginas criadas e devolve os pares já recebidos."""
+        tree = self.tree
+        items = []
+        ref = self.first_leaf
+        while ref is not None:
+            leaf = tree._load(ref)
+            items.extend(zip(leaf.keys, leaf.children))
+            ref = leaf.next
+        items.extend(self.items)
+        # Todo nó criado está na subárvore de alguma entrada ainda sem pai
+        stack = [ref for pending in self.levels for _, ref in pending]
+        while stack:
+            node = tree._load(stack.pop())
+            if not node.is_leaf:
+                stack.extend(node.children)
+            tree._free(node)
+        return items
+
+_MISSING = object()
+_DELETE = object() # Marca de remoção nas operações em lote
+
 class BPlusTree:
-    def __init__(self, order=3):
-        self.root = BPlusNode(order)
-        self.root.is_leaf = True
+    """
+    Árvore B+ que mapeia chave -> valor (os valores ficam em 'children' das folhas).
+    Com 'key_type' (e opcionalmente 'value_type') igual a um typecode de array.array
+    (ex.: 'q' para int64, 'd' para float64), as folhas guardam chaves e valores em
+    buffers compactos em vez de listas de objetos.
+    """
+    def __init__(self, order=3, key_type=None, value_type=None):
         self.order = order
+        self.key_type = key_type
+        self.value_type = value_type
+        self.root = self._new_node(True)
+        self._version = 0 # Incrementado a cada modificação (invalida cursores abertos)
+
+    # Ganchos de armazenamento. Em memória, a referência a um nó (em children,
+    # next e prev) é o próprio objeto; a PagedBPlusTree usa números de página.
+    def _ref(self, node):
+        return node
+
+    def _load(self, ref):
+        return ref
+
+    def _new_node(self, is_leaf):
+        return self._make_node(is_leaf)
+
+    def _make_node(self, is_leaf):
+        node = BPlusNode(self.order)
+        node.is_leaf = is_leaf
+        if is_leaf and self.key_type is not None:
+            node.keys = array(self.key_type)
+        if is_leaf and self.value_type is not None:
+            node.children = array(self.value_type)
+        return node
+
+    def _dirty(self, node):
+        pass
+
+    def _free(self, node):
+        pass
+
+    @classmethod
+    def bulk_load(cls, keys, order=3, fill_factor=1.0, with_values=False, **kwargs):
+        """
+        Constrói a árvore de baixo para cima em O(n), sem passar por insert().
+        As folhas são empacotadas da esquerda para a direita (com o encadeamento 'next')
+        e cada pai é criado assim que os seus filhos ficam prontos.
+        'fill_factor' controla a ocupação das páginas (1.0 = páginas cheias).
+        Com with_values=True, 'keys' deve produzir pares (chave, valor).
+        Argumentos extras são repassados ao construtor (ex.: 'path' da PagedBPlusTree).
+
+        Memória: entrada em ordem é consumida em uma única passada, guardando
+        além da árvore só as páginas ainda sem pai (menos de duas por nível).
+        Na primeira chave fora de ordem a montagem é desfeita e a entrada inteira
+        (o que já foi lido mais o restante) é ordenada em uma lista de pares,
+        O(n) de memória extra. Em chaves repetidas vale o último valor.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor deve estar no intervalo (0, 1]")
+        tree = cls(order=order, **kwargs)
+        min_keys = math.ceil(order / 2) - 1
+        per_leaf = max(1, min_keys, min(order - 1, round((order - 1) * fill_factor)))
+        min_children = math.ceil(order / 2)
+        per_node = max(2, min_children, min(order, round(order * fill_factor)))
+
+        items = iter(keys if with_values else ((key, None) for key in keys))
+        first = next(items, _MISSING)
+        if first is _MISSING:
+            return tree
+        tree._free(tree.root)
+
+        builder = _BulkBuilder(tree, per_leaf, per_node)
+        builder.add(first)
+        for item in items:
+            if item[0] < builder.items[-1][0]:
+                # Fora de ordem: ordena tudo e monta de novo
+                ordered = sorted(chain(builder.discard(), [item], items), key=lambda kv: kv[0])
+                builder = _BulkBuilder(tree, per_leaf, per_node)
+                for item in ordered:
+                    builder.add(item)
+                break
+            builder.add(item)
+
+        tree.root = tree._load(builder.finish())
+        return tree
 
     def search(self, k):
-        leaf = self.leaf_search(k, self.root)
-        for i, key in enumerate(leaf.keys):
-            if k == key: return True
-        return False
+        return self.get(k, _MISSING) is not _MISSING
 
-    def leaf_search(self, k, node):
-        if node.is_leaf: return node
-        i = 0
-        while i < len(node.keys) and k >= node.keys[i]: i += 1
-        return self.leaf_search(k, node.children[i])
-
-    def insert(self, key):
-        leaf = self.leaf_search(key, self.root)
-        self._insert_into_leaf(leaf, key)
-        if len(leaf.keys) > (self.order - 1): self._split_leaf(leaf)
-
-    def _insert_into_leaf(self, leaf, key):
-        if not leaf.keys:
-            leaf.keys.append(key)
-            leaf.children.append(key) # Em B+ Tree simples, ponteiro de dados é a própria chave ou ref
+    def get(self, key, default=None):
+        leaf = self.leaf_search(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.children[i]
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def leaf_search(self, k, node=None):
+        if node is None:
+            node = self.root
+        while not node.is_leaf:
+            node = self._load(node.children[bisect_right(node.keys, k)])
+        return node
+
+    def _find_leaf(self, k):
+        """
+        Descida iterativa que guarda, para cada nível, o par (nó, índice do filho seguido).
+        Com esse caminho, splits e merges sabem a posição de um nó no pai sem busca linear.
+        """
+        path = []
+        node = self.root
+        while not node.is_leaf:
+            i = bisect_right(node.keys, k)
+            path.append((node, i))
+            node = self._load(node.children[i])
+        return node, path
+
+    def range(self, lo=None, hi=None, inclusive=True, limit=None, reverse=False):
+        """
+        Gera as chaves no intervalo [lo, hi], descendo uma única vez até a folha
+        inicial e seguindo o encadeamento das folhas de forma preguiçosa.
+        'inclusive' pode ser um bool ou uma tupla (inclui_lo, inclui_hi).
+        Lança RuntimeError se a árvore for modificada durante a iteração.
+        """
+        return (key for key, _ in self.items(lo, hi, inclusive, limit, reverse))
+
+    def items(self, lo=None, hi=None, inclusive=True, limit=None, reverse=False):
+        """Como range(), mas gera pares (chave, valor)."""
+        lo_inc, hi_inc = inclusive if isinstance(inclusive, tuple) else (inclusive, inclusive)
+        if reverse:
+            pairs = self._walk_backward(hi, hi_inc)
+            bound, bound_inc, past = lo, lo_inc, lambda k: k < lo
+        else:
+            pairs = self._walk_forward(lo, lo_inc)
+            bound, bound_inc, past = hi, hi_inc, lambda k: k > hi
+        return self._take(pairs, bound, bound_inc, past, limit)
+
+    def iter_from(self, key, reverse=False, limit=None):
+        """Cursor a partir de 'key' (chaves >= key, ou <= key se reverse=True)."""
+        walk = self._walk_backward if reverse else self._walk_forward
+        return (k for k, _ in self._take(walk(key, True), None, True, None, limit))
+
+    def __iter__(self):
+        return (key for key, _ in self._walk_forward())
+
+    def __reversed__(self):
+        return (key for key, _ in self._walk_backward())
+
+    def _take(self, pairs, bound, bound_inc, past, limit):
+        if limit is not None and limit <= 0:
             return
-        for i, item in enumerate(leaf.keys):
-            if key < item:
-                leaf.keys.insert(i, key)
-                leaf.children.insert(i, key)
+        count = 0
+        for pair in pairs:
+            key = pair[0]
+            if bound is not None and (past(key) or (key == bound and not bound_inc)):
                 return
-        leaf.keys.append(key)
-        leaf.children.append(key)
+            yield pair
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def _first_leaf(self):
+        node = self.root
+        while not node.is_leaf:
+            node = self._load(node.children[0])
+        return node
+
+    def _last_leaf(self):
+        node = self.root
+        while not node.is_leaf:
+            node = self._load(node.children[-1])
+        return node
+
+    def _walk_forward(self, start=None, inclusive=True):
+        version = self._version
+        if start is None:
+            leaf, i = self._first_leaf(), 0
+        else:
+            leaf = self.leaf_search(start, self.root)
+            i = bisect_left(leaf.keys, start) if inclusive else bisect_right(leaf.keys, start)
+        while leaf is not None:
+            while i < len(leaf.keys):
+                if self._version != version:
+                    raise RuntimeError("BPlusTree modificada durante a iteração")
+                yield leaf.keys[i], leaf.children[i]
+                i += 1
+            leaf, i = self._load(leaf.next), 0
+
+    def _walk_backward(self, start=None, inclusive=True):
+        version = self._version
+        if start is None:
+            leaf = self._last_leaf()
+            i = len(leaf.keys) - 1
+        else:
+            leaf = self.leaf_search(start, self.root)
+            i = (bisect_right(leaf.keys, start) if inclusive else bisect_left(leaf.keys, start)) - 1
+        while leaf is not None:
+            while i >= 0:
+                if self._version != version:
+                    raise RuntimeError("BPlusTree modificada durante a iteração")
+                yield leaf.keys[i], leaf.children[i]
+                i -= 1
+            leaf = self._load(leaf.prev)
+            if leaf is not None:
+                i = len(leaf.keys) - 1
+
+    def insert(self, key, value=None):
+        leaf, path = self._find_leaf(key)
+        self._insert_at(leaf, path, key, value)
+
+    def _insert_at(self, leaf, path, key, value):
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            # Chave existente: apenas atualiza o valor (a estrutura não muda)
+            leaf.children[i] = value
+            self._dirty(leaf)
+            return
+        self._version += 1
+        leaf.keys.insert(i, key)
+        leaf.children.insert(i, value)
+        self._dirty(leaf)
+        if len(leaf.keys) > (self.order - 1): self._split_leaf(leaf, path)
 
-    def _split_leaf(self, node):
+    def _split_leaf(self, node, path):
         mid_idx = len(node.keys) // 2
-        new_node = BPlusNode(self.order)
-        new_node.is_leaf = True
-        new_node.parent = node.parent
+        new_node = self._new_node(True)
         new_node.keys = node.keys[mid_idx:]
         new_node.children = node.children[mid_idx:]
         node.keys = node.keys[:mid_idx]
         node.children = node.children[:mid_idx]
+        self._link_after(node, new_node)
+        self._insert_into_parent(node, new_node.keys[0], new_node, path)
+
+    def _link_after(self, node, new_node):
+        # Encaixa new_node logo após node no encadeamento das folhas
         new_node.next = node.next
-        node.next = new_node
-        self._insert_into_parent(node, new_node.keys[0], new_node)
+        new_node.prev = self._ref(node)
+        if node.next is not None:
+            following = self._load(node.next)
+            following.prev = self._ref(new_node)
+            self._dirty(following)
+        node.next = self._ref(new_node)
+        self._dirty(node)
+        self._dirty(new_node)
 
-    def _insert_into_parent(self, left_child, key, right_child):
-        parent = left_child.parent
-        if parent is None:
-            new_root = BPlusNode(self.order)
+    def _insert_into_parent(self, left_child, key, right_child, path):
+        if not path:
+            new_root = self._new_node(False)
             new_root.keys = [key]
-            new_root.children = [left_child, right_child]
-            new_root.is_leaf = False
+            new_root.children = [self._ref(left_child), self._ref(right_child)]
+            self._dirty(new_root)
             self.root = new_root
-            left_child.parent = new_root
-            right_child.parent = new_root
             return
-        insert_idx = 0
-        while insert_idx < len(parent.keys) and parent.keys[insert_idx] < key: insert_idx += 1
+        # O índice do filho da esquerda no pai veio da descida
+        parent, insert_idx = path.pop()
         parent.keys.insert(insert_idx, key)
-        parent.children.insert(insert_idx + 1, right_child)
-        right_child.parent = parent
-        if len(parent.keys) > (self.order - 1): self._split_internal(parent)
+        parent.children.insert(insert_idx + 1, self._ref(right_child))
+        self._dirty(parent)
+        if len(parent.keys) > (self.order - 1): self._split_internal(parent, path)
 
-    def _split_internal(self, node):
+    def _split_internal(self, node, path):
         mid_idx = len(node.keys) // 2
         key_to_promote = node.keys[mid_idx]
-        new_node = BPlusNode(self.order)
-        new_node.is_leaf = False
-        new_node.parent = node.parent
+        new_node = self._new_node(False)
         new_node.keys = node.keys[mid_idx+1:]
         new_node.children = node.children[mid_idx+1:]
-        for child in new_node.children: child.parent = new_node
         node.keys = node.keys[:mid_idx]
         node.children = node.children[:mid_idx+1]
-        self._insert_into_parent(node, key_to_promote, new_node)
+        self._dirty(node)
+        self._dirty(new_node)
+        self._insert_into_parent(node, key_to_promote, new_node, path)
 
     def remove(self, key):
-        leaf = self.leaf_search(key, self.root)
-        if key not in leaf.keys:
+        leaf, path = self._find_leaf(key)
+        self._remove_at(leaf, path, key)
+
+    def _remove_at(self, leaf, path, key):
+        idx = bisect_left(leaf.keys, key)
+        if idx == len(leaf.keys) or leaf.keys[idx] != key:
             print(f"Chave {key} não encontrada.")
             return
+        self._version += 1
 
         # 1. Remove da folha
-        idx = leaf.keys.index(key)
         leaf.keys.pop(idx)
         leaf.children.pop(idx) # Remove o dado associado
+        self._dirty(leaf)
 
         # 2. Verifica Underflow (exceto se for a raiz)
-        if leaf != self.root and leaf.is_underflow():
-            self._handle_underflow(leaf)
+        if path and leaf.is_underflow():
+            self._handle_underflow(leaf, path)
         
         # 3. Caso especial: Raiz vazia
+        self._collapse_root()
+
+    def _collapse_root(self):
         if len(self.root.keys) == 0 and not self.root.is_leaf:
             # A raiz antiga sumiu, o primeiro filho vira a nova raiz
-            self.root = self.root.children[0]
-            self.root.parent = None
+            old_root = self.root
+            self.root = self._load(old_root.children[0])
+            self._free(old_root)
+
+    def _apply_batch(self, ops):
+        """
+        Aplica uma lista de operações [(chave, valor ou _DELETE)] ordenada por chave.
+        Cada folha atingida é visitada uma única vez: uma descida, um merge linear
+        das chaves e, se preciso, os splits/merges para voltar aos limites de ocupação.
+        """
+        if not ops:
+            return
+        self._version += 1
+        p = 0
+        while p < len(ops):
+            anchor = ops[p][0]
+            leaf, path = self._find_leaf(anchor)
+            # Limite superior da folha: separador do ancestral mais próximo
+            upper = None
+            for node, i in reversed(path):
+                if i < len(node.keys):
+                    upper = node.keys[i]
+                    break
+            end = p
+            while end < len(ops) and (upper is None or ops[end][0] < upper):
+                end += 1
+            self._merge_into_leaf(leaf, ops[p:end])
+            p = end
+
+            if len(leaf.keys) > (self.order - 1):
+                self._split_many(leaf)
+            while path and leaf.is_underflow():
+                # Um empréstimo pode não bastar se o lote removeu várias chaves
+                self._handle_underflow(leaf, path)
+                self._collapse_root()
+                leaf, path = self._find_leaf(anchor)
+            self._collapse_root()
+
+    def _merge_into_leaf(self, leaf, ops):
+        keys, values = leaf.keys, leaf.children
+        i = 0
+        for key, value in ops:
+            # As operações estão ordenadas: cada busca começa onde a anterior parou
+            i = bisect_left(keys, key, i)
+            found = i < len(keys) and keys[i] == key
+            if value is _DELETE:
+                if found:
+                    del keys[i]
+                    del values[i]
+            elif found:
+                values[i] = value
+            else:
+                keys.insert(i, key)
+                values.insert(i, value)
+                i += 1
+        self._dirty(leaf)
 
-    def _handle_underflow(self, node):
-        parent = node.parent
-        # Encontrar índice do nó no pai
-        idx = parent.children.index(node)
+    def _split_many(self, leaf):
+        # Divide uma folha muito cheia em pedaços equilibrados de uma só vez
+        keys, values = list(leaf.keys), list(leaf.children)
+        pieces = -(-len(keys) // (self.order - 1))
+        bounds = [len(keys) * j // pieces for j in range(pieces + 1)]
+        del leaf.keys[bounds[1]:]
+        del leaf.children[bounds[1]:]
+        prev = leaf
+        for j in range(1, pieces):
+            new_node = self._new_node(True)
+            new_node.keys.extend(keys[bounds[j]:bounds[j + 1]])
+            new_node.children.extend(values[bounds[j]:bounds[j + 1]])
+            self._link_after(prev, new_node)
+            # A descida pelo novo separador chega em 'prev', que ainda cobre esse intervalo
+            _, path = self._find_leaf(new_node.keys[0])
+            self._insert_into_parent(prev, new_node.keys[0], new_node, path)
+            prev = new_node
+
+    def _handle_underflow(self, node, path):
+        # Índice do nó no pai, registrado durante a descida
+        parent, idx = path.pop()
 
         # Tentar pegar do irmão da ESQUERDA
         if idx > 0:
-            sibling = parent.children[idx - 1]
+            sibling = self._load(parent.children[idx - 1])
             if len(sibling.keys) > (math.ceil(self.order/2) - 1):
                 self._borrow_from_left(node, sibling, parent, idx)
                 return
 
         # Tentar pegar do irmão da DIREITA
         if idx < len(parent.children) - 1:
-            sibling = parent.children[idx + 1]
+            sibling = self._load(parent.children[idx + 1])
             if len(sibling.keys) > (math.ceil(self.order/2) - 1):
                 self._borrow_from_right(node, sibling, parent, idx)
                 return
@@ -136,12 +521,12 @@ class BPlusTree:
         # Se não der para emprestar, faz MERGE
         # Preferência: Merge com a esquerda
         if idx > 0:
-            sibling = parent.children[idx - 1]
-            self._merge(sibling, node, parent, idx - 1)
+            sibling = self._load(parent.children[idx - 1])
+            self._merge(sibling, node, parent, idx - 1, path)
         else:
             # Merge com a direita
-            sibling = parent.children[idx + 1]
-            self._merge(node, sibling, parent, idx)
+            sibling = self._load(parent.children[idx + 1])
+            self._merge(node, sibling, parent, idx, path)
 
     def _borrow_from_left(self, node, sibling, parent, idx):
         if node.is_leaf:
@@ -160,9 +545,11 @@ class BPlusTree:
             
             node.keys.insert(0, parent_key)
             node.children.insert(0, sibling_child)
-            sibling_child.parent = node
             
             parent.keys[idx-1] = sibling_key
+        self._dirty(node)
+        self._dirty(sibling)
+        self._dirty(parent)
 
     def _borrow_from_right(self, node, sibling, parent, idx):
         if node.is_leaf:
@@ -181,32 +568,73 @@ class BPlusTree:
             
             node.keys.append(parent_key)
             node.children.append(sibling_child)
-            sibling_child.parent = node
             
             parent.keys[idx] = sibling_key
+        self._dirty(node)
+        self._dirty(sibling)
+        self._dirty(parent)
 
-    def _merge(self, left, right, parent, idx_separator):
+    def _merge(self, left, right, parent, idx_separator, path):
         # Merge: Esquerda engole a Direita
         if left.is_leaf:
             left.keys.extend(right.keys)
             left.children.extend(right.children)
             left.next = right.next
+            if right.next is not None:
+                following = self._load(right.next)
+                following.prev = self._ref(left)
+                self._dirty(following)
         else:
             # Merge interno: precisa descer a chave do pai para o meio
             separator = parent.keys[idx_separator]
             left.keys.append(separator)
             left.keys.extend(right.keys)
             left.children.extend(right.children)
-            for child in right.children:
-                child.parent = left
         
         # Remove a referência da direita no pai
         parent.keys.pop(idx_separator)
         parent.children.pop(idx_separator + 1)
+        self._dirty(left)
+        self._dirty(parent)
+        self._free(right)
 
         # O pai perdeu uma chave/filho, verificar Underflow no pai
-        if parent != self.root and parent.is_underflow():
-            self._handle_underflow(parent)
+        if path and parent.is_underflow():
+            self._handle_underflow(parent, path)
+
+    def check_invariants(self):
+        """
+        Verifica as propriedades da árvore (ocupação dos nós, ordenação, separadores,
+        folhas na mesma profundidade e encadeamento next/prev).
+        Lança AssertionError no primeiro problema encontrado; retorna o total de chaves.
+        """
+        min_keys = math.ceil(self.order / 2) - 1
+        leaves = []
+        stack = [(self.root, None, None, 0)]
+        depths = set()
+        while stack:
+            node, lo, hi, depth = stack.pop()
+            keys = list(node.keys)
+            assert len(keys) <= self.order - 1, f"nó com chaves demais: {keys}"
+            if node is not self.root:
+                assert len(keys) >= min_keys, f"nó em underflow: {keys}"
+            assert all(a < b for a, b in zip(keys, keys[1:])), f"chaves fora de ordem: {keys}"
+            assert all((lo is None or k >= lo) and (hi is None or k < hi) for k in keys), \
+                f"chaves {keys} fora do intervalo [{lo}, {hi})"
+            if node.is_leaf:
+                assert len(node.children) == len(keys), "folha com chaves e valores desalinhados"
+                depths.add(depth)
+                leaves.append(node)
+                continue
+            assert len(node.children) == len(keys) + 1, f"nó interno com {len(node.children)} filhos e {len(keys)} chaves"
+            bounds = [lo] + keys + [hi]
+            for i in reversed(range(len(node.children))):
+                stack.append((self._load(node.children[i]), bounds[i], bounds[i + 1], depth + 1))
+        assert len(depths) == 1, f"folhas em profundidades diferentes: {sorted(depths)}"
+        for left, right in zip(leaves, leaves[1:]):
+            assert left.next == self._ref(right) and right.prev == self._ref(left), "encadeamento das folhas quebrado"
+        assert leaves[0].prev is None and leaves[-1].next is None, "pontas do encadeamento das folhas"
+        return sum(len(leaf.keys) for leaf in leaves)
 
     def print_tree(self):
         print("\n--- Estado da Árvore ---")
@@ -217,9 +645,51 @@ class BPlusTree:
             count = len(queue)
             while count > 0:
                 n = queue.pop(0)
-                print(f"{n.keys}", end="  ")
+                print(f"{list(n.keys)}", end="  ")
                 if not n.is_leaf:
-                    queue.extend(n.children)
+                    queue.extend(self._load(c) for c in n.children)
                 count -= 1
             print()
-            level += 1
\ No newline at end of file
+            level += 1
+
+
+class BufferedBPlusTree(BPlusTree):
+    """
+    Modo de ingestão para cargas com muitas escritas: insert/remove vão para um
+    buffer em memória e são aplicados em lote (flush_buffer) quando ele enche,
+    tocando cada folha uma única vez por lote. Leituras pontuais consultam o
+    buffer; varreduras (range/items/iter_from/iter) esvaziam o buffer antes.
+    """
+    def __init__(self, order=3, buffer_size=1024, key_type=None, value_type=None):
+        super().__init__(order, key_type, value_type)
+        self.buffer_size = buffer_size
+        self._buffer = {} # chave -> valor ou _DELETE (a última operação vence)
+
+    def insert(self, key, value=None):
+        self._buffer[key] = value
+        if len(self._buffer) >= self.buffer_size:
+            self.flush_buffer()
+
+    def remove(self, key):
+        self._buffer[key] = _DELETE
+        if len(self._buffer) >= self.buffer_size:
+            self.flush_buffer()
+
+    def get(self, key, default=None):
+        value = self._buffer.get(key, _MISSING)
+        if value is _MISSING:
+            return super().get(key, default)
+        return default if value is _DELETE else value
+
+    def flush_buffer(self):
+        ops = sorted(self._buffer.items(), key=lambda kv: kv[0])
+        self._buffer = {}
+        self._apply_batch(ops)
+
+    def _walk_forward(self, start=None, inclusive=True):
+        self.flush_buffer()
+        return super()._walk_forward(start, inclusive)
+
+    def _walk_backward(self, start=None, inclusive=True):
+        self.flush_buffer()
+        return super()._walk_backward(start, inclusive)
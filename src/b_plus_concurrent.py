@@ -0,0 +1,239 @@
+import math
+import threading
+from bisect import bisect_left, bisect_right
+
+from .b_plus import BPlusTree
+
+
+class RWLatch:
+    """Latch leitor/escritor com preferência para escritores."""
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self._owner = None # Thread que segura o latch de escrita
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+            self._owner = threading.get_ident()
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._owner = None
+            self._cond.notify_all()
+
+    def held_by_me(self):
+        """Se a thread atual segura o latch de escrita."""
+        return self._owner == threading.get_ident()
+
+
+class ConcurrentBPlusTree(BPlusTree):
+    """
+    BPlusTree segura para várias threads, com um latch leitor/escritor por nó
+    e "latch crabbing":
+    - Leitores descem segurando no máximo dois latches de leitura (pai e filho).
+    - Escritores descem com latches de escrita e soltam os ancestrais assim que
+      encontram um nó "seguro", que não vai sofrer split (insert) nem merge (remove).
+    O ponteiro para a raiz tem o seu próprio latch. Latches são pedidos sempre de
+    cima para baixo; irmãos só são presos sob o latch exclusivo do pai.
+    As varreduras são fracamente consistentes: não lançam erro por modificações
+    concorrentes e geram as chaves em ordem, sem repetição.
+    Apenas para a árvore em memória (o BufferPool da PagedBPlusTree não é thread-safe).
+    """
+    def __init__(self, order=3, key_type=None, value_type=None):
+        self._root_latch = RWLatch()
+        super().__init__(order, key_type, value_type)
+
+    def _make_node(self, is_leaf):
+        node = super()._make_node(is_leaf)
+        node.latch = RWLatch()
+        return node
+
+    # Leitura
+    def _descend_read(self, key):
+        # Devolve a folha com o latch de leitura adquirido (key=None: folha mais à esquerda)
+        self._root_latch.acquire_read()
+        node = self.root
+        node.latch.acquire_read()
+        self._root_latch.release_read()
+        while not node.is_leaf:
+            child = node.children[0 if key is None else bisect_right(node.keys, key)]
+            child.latch.acquire_read()
+            node.latch.release_read()
+            node = child
+        return node
+
+    def _descend_read_before(self, bound, inclusive):
+        """
+        Desce até a folha que contém as maiores chaves <= bound (ou < bound).
+        Devolve também o limite inferior do intervalo dessa folha (None na primeira folha).
+        """
+        self._root_latch.acquire_read()
+        node = self.root
+        node.latch.acquire_read()
+        self._root_latch.release_read()
+        lower = None
+        while not node.is_leaf:
+            if bound is None:
+                i = len(node.keys)
+            else:
+                i = bisect_right(node.keys, bound) if inclusive else bisect_left(node.keys, bound)
+            if i > 0:
+                lower = node.keys[i - 1]
+            child = node.children[i]
+            child.latch.acquire_read()
+            node.latch.release_read()
+            node = child
+        return node, lower
+
+    def get(self, key, default=None):
+        leaf = self._descend_read(key)
+        try:
+            i = bisect_left(leaf.keys, key)
+            if i < len(leaf.keys) and leaf.keys[i] == key:
+                return leaf.children[i]
+            return default
+        finally:
+            leaf.latch.release_read()
+
+    def _walk_forward(self, start=None, inclusive=True):
+        leaf = self._descend_read(start)
+        if start is None:
+            i = 0
+        else:
+            i = bisect_left(leaf.keys, start) if inclusive else bisect_right(leaf.keys, start)
+        last = None
+        while True:
+            # Copia a folha e solta o latch antes de entregar as chaves ao chamador
+            keys, values = list(leaf.keys[i:]), list(leaf.children[i:])
+            following = leaf.next
+            leaf.latch.release_read()
+            for key, value in zip(keys, values):
+                # Um split concorrente pode mover para a frente chaves já entregues
+                if last is None or key > last[0]:
+                    last = (key,)
+                    yield key, value
+            if following is None:
+                return
+            leaf = following
+            leaf.latch.acquire_read()
+            i = 0
+
+    def _walk_backward(self, start=None, inclusive=True):
+        # Pedir o latch da folha da esquerda segurando o atual inverteria a ordem
+        # dos latches; em vez de seguir 'prev', cada folha é alcançada por uma nova
+        # descida, buscando as chaves abaixo do limite inferior da folha anterior.
+        bound = start
+        while True:
+            leaf, lower = self._descend_read_before(bound, inclusive)
+            if bound is None:
+                i = len(leaf.keys)
+            else:
+                i = bisect_right(leaf.keys, bound) if inclusive else bisect_left(leaf.keys, bound)
+            keys, values = list(leaf.keys[:i]), list(leaf.children[:i])
+            leaf.latch.release_read()
+            for key, value in zip(reversed(keys), reversed(values)):
+                yield key, value
+            if lower is None:
+                return
+            bound, inclusive = lower, False
+
+    # Escrita
+    def _descend_write(self, key, is_safe):
+        """
+        Desce com latches de escrita. Devolve (folha, caminho, latches_presos);
+        o caminho contém apenas os ancestrais que continuam presos.
+        """
+        held = [self._root_latch]
+        self._root_latch.acquire_write()
+        node = self.root
+        node.latch.acquire_write()
+        held.append(node.latch)
+        path = []
+        is_root = True # Sem reler self.root: o latch da raiz pode já ter sido solto
+        while True:
+            if is_safe(node, is_root):
+                # Nada acima deste nó será alterado: solta os ancestrais
+                for latch in held[:-1]:
+                    latch.release_write()
+                held = held[-1:]
+                path = []
+            if node.is_leaf:
+                return node, path, held
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = node.children[i]
+            is_root = False
+            node.latch.acquire_write()
+            held.append(node.latch)
+
+    def _safe_for_insert(self, node, is_root):
+        return len(node.keys) < self.order - 1
+
+    def _safe_for_remove(self, node, is_root):
+        if is_root:
+            return node.is_leaf or len(node.keys) > 1
+        return len(node.keys) > math.ceil(self.order / 2) - 1
+
+    def insert(self, key, value=None):
+        leaf, path, held = self._descend_write(key, self._safe_for_insert)
+        try:
+            self._insert_at(leaf, path, key, value)
+        finally:
+            for latch in held:
+                latch.release_write()
+
+    def remove(self, key):
+        leaf, path, held = self._descend_write(key, self._safe_for_remove)
+        try:
+            self._remove_at(leaf, path, key)
+        finally:
+            for latch in held:
+                latch.release_write()
+
+    def _collapse_root(self):
+        # A raiz só fica vazia se não era segura para remoção, e então esta thread
+        # ainda segura o latch do ponteiro da raiz, como no split que instala uma
+        # raiz nova. Se ele já foi solto, a raiz não muda e nem é lida: outro
+        # escritor pode estar trocando-a. Pedir o latch agora, segurando latches
+        # de nós mais abaixo, inverteria a ordem de cima para baixo.
+        if self._root_latch.held_by_me():
+            super()._collapse_root()
+
+    # O 'prev' do vizinho da direita, alterado em splits e merges de folhas, só é
+    # escrito por quem segura o latch do seu antecessor, então não precisa de latch
+    # próprio (e nenhum leitor concorrente o usa: veja _walk_backward).
+    def _handle_underflow(self, node, path):
+        # Os irmãos são filhos do pai (já preso com escrita): prende esquerda e direita
+        parent, idx = path[-1]
+        siblings = []
+        if idx > 0:
+            siblings.append(parent.children[idx - 1])
+        if idx < len(parent.children) - 1:
+            siblings.append(parent.children[idx + 1])
+        for sibling in siblings:
+            sibling.latch.acquire_write()
+        try:
+            super()._handle_underflow(node, path)
+        finally:
+            for sibling in siblings:
+                sibling.latch.release_write()
@@ -0,0 +1,502 @@
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .b_plus import BPlusNode, BPlusTree
+
+MAGIC = b"BPT2"
+NO_PAGE = -1
+# magic, page_size, order, raiz, total de páginas, início da lista livre, typecodes de chave e valor
+_HEADER = struct.Struct("<4sIIqqq1s1s")
+# Início de cada página: tipo, nº de chaves, next e prev (na página livre, next é a próxima livre)
+_PAGE = struct.Struct("<BxxxIqq")
+_FREE, _INTERNAL, _LEAF = 0, 1, 2
+_LENGTH = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_SWAP = sys.byteorder != "little" # Os arrays são gravados sempre em little-endian
+
+
+class BufferPool:
+    """
+    Cache LRU de páginas já desserializadas.
+    Páginas sujas só vão para o disco quando são expulsas do cache ou em flush().
+    'read(page_id)' e 'write(page_id, node)' fazem a E/S de fato.
+    """
+    def __init__(self, capacity, read, write):
+        if capacity < 1:
+            raise ValueError("capacity deve ser >= 1")
+        self.capacity = capacity
+        self._read = read
+        self._write = write
+        self.pages = OrderedDict() # page_id -> nó, do menos para o mais recente
+        self.dirty = set()
+        self._pinned = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+
+    def get(self, page_id):
+        node = self.pages.get(page_id)
+        if node is not None:
+            self.hits += 1
+            self.pages.move_to_end(page_id)
+        else:
+            self.misses += 1
+            node = self._read(page_id)
+            self.pages[page_id] = node
+        self._pin(page_id)
+        self._evict()
+        return node
+
+    def put(self, page_id, node):
+        """Registra (ou reinsere) a página como suja."""
+        self.pages[page_id] = node
+        self.pages.move_to_end(page_id)
+        self.dirty.add(page_id)
+        self._pin(page_id)
+        self._evict()
+
+    def discard(self, page_id):
+        self.pages.pop(page_id, None)
+        self.dirty.discard(page_id)
+
+    def flush(self):
+        for page_id in sorted(self.dirty):
+            self._write(page_id, self.pages[page_id])
+            self.dirty.remove(page_id)
+            self.writes += 1
+
+    @contextmanager
+    def pinned(self):
+        """
+        Mantém no cache todas as páginas acessadas dentro do bloco, para que uma
+        operação da árvore nunca trabalhe com duas cópias da mesma página.
+        O cache pode passar temporariamente da capacidade.
+        """
+        if self._pinned is not None:
+            yield
+            return
+        self._pinned = set()
+        try:
+            yield
+        finally:
+            self._pinned = None
+            self._evict()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "writes": self.writes,
+            "cached": len(self.pages),
+            "dirty": len(self.dirty),
+        }
+
+    def _pin(self, page_id):
+        if self._pinned is not None:
+            self._pinned.add(page_id)
+
+    def _evict(self):
+        while len(self.pages) > self.capacity:
+            for page_id in self.pages:
+                if self._pinned is None or page_id not in self._pinned:
+                    break
+            else:
+                return # Tudo fixado: espera o fim da operação
+            # Grava antes de tirar do cache: se a escrita falhar, a página suja continua aqui
+            if page_id in self.dirty:
+                self._write(page_id, self.pages[page_id])
+                self.dirty.remove(page_id)
+                self.writes += 1
+            del self.pages[page_id]
+            self.evictions += 1
+
+
+class PagedBPlusTree(BPlusTree):
+    """
+    BPlusTree persistida em um único arquivo de páginas de tamanho fixo.
+    A página 0 guarda o cabeçalho; cada nó ocupa uma página e as referências
+    (filhos, next e prev) são números de página. Os nós acessados passam por um
+    BufferPool LRU; use flush() (ou close()) para gravar tudo no disco.
+    A API (insert/search/remove/range/iter_from) é a mesma da árvore em memória.
+    Um insert/remove que deixaria algum nó maior que page_size levanta ValueError
+    e é desfeito por inteiro: a árvore continua como estava.
+
+    As páginas têm um formato fixo (struct e array, sem pickle), então ler um
+    arquivo de origem desconhecida não executa código; um arquivo adulterado só
+    causa ValueError. Com key_type/value_type (typecodes de array.array) as
+    chaves/valores viram arrays; sem eles, só são aceitos None, bool, int, float,
+    str, bytes e tuplas desses tipos (outro tipo levanta TypeError no insert).
+    """
+    def __init__(self, path, order=64, page_size=4096, pool_size=256, key_type=None, value_type=None):
+        self.path = path
+        self._version = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "r+b" if exists else "w+b")
+        if exists:
+            header = _HEADER.unpack(self._file.read(_HEADER.size))
+            magic, page_size, order, root_id, n_pages, free_head, key_code, value_code = header
+            if magic != MAGIC:
+                self._file.close()
+                raise ValueError(f"{path} não é um arquivo de PagedBPlusTree")
+            key_type = key_code.decode() if key_code != b"\0" else None
+            value_type = value_code.decode() if value_code != b"\0" else None
+            for code in (key_type, value_type):
+                if code is not None:
+                    array(code) # Typecode inválido: ValueError
+        else:
+            if page_size < _HEADER.size:
+                raise ValueError("page_size pequeno demais")
+            root_id, n_pages, free_head = 1, 1, NO_PAGE
+        self.order = order
+        self.key_type = key_type
+        self.value_type = value_type
+        self.page_size = page_size
+        self._root_id = root_id
+        self._n_pages = n_pages
+        self._free_head = free_head
+        self._pool = BufferPool(pool_size, self._read_page, self._write_page)
+        self._undo = None # Durante insert/remove: page_id -> estado anterior (None se a página é nova)
+        self._touched = None # Durante insert/remove: páginas alteradas
+        self._encoded = {} # page_id -> bytes já conferidos de uma página suja (evita codificar de novo)
+
+        if not exists:
+            root = self._new_node(True)
+            self._root_id = root.page_id
+            self.flush()
+
+    @property
+    def root(self):
+        return self._page(self._root_id)
+
+    @root.setter
+    def root(self, node):
+        self._root_id = node.page_id
+
+    @property
+    def pool(self):
+        return self._pool
+
+    # Operações da árvore: as páginas tocadas ficam fixadas até o fim
+    def insert(self, key, value=None):
+        with self._operation():
+            super().insert(key, value)
+
+    def remove(self, key):
+        with self._operation():
+            super().remove(key)
+
+    def get(self, key, default=None):
+        with self._pool.pinned():
+            return super().get(key, default)
+
+    @contextmanager
+    def _operation(self):
+        """
+        Guarda o estado anterior de cada página tocada. No fim, toda página
+        alterada precisa caber em page_size (durante um split o nó passa do
+        limite só temporariamente); se alguma não couber, ou se a operação
+        falhar no meio, tudo é restaurado antes de a exceção subir.
+        """
+        with self._pool.pinned():
+            saved = (self._root_id, self._n_pages, self._free_head, self._version)
+            self._undo, self._touched = {}, set()
+            try:
+                yield
+                for page_id in self._touched:
+                    node = self._pool.pages.get(page_id)
+                    if node is not None: # None: página liberada
+                        self._encoded[page_id] = self._check_size(self._encode(node))
+            except BaseException:
+                self._rollback(saved)
+                raise
+            finally:
+                self._undo = self._touched = None
+
+    def _rollback(self, saved):
+        self._root_id, self._n_pages, self._free_head, self._version = saved
+        for page_id, state in self._undo.items():
+            self._encoded.pop(page_id, None)
+            if state is None:
+                self._pool.discard(page_id) # Página criada pela operação
+                continue
+            node = self._pool.pages.get(page_id)
+            if node is None: # Liberada pela operação: volta ao cache e será regravada
+                node = BPlusNode(self.order)
+                node.page_id = page_id
+                self._touched.add(page_id)
+            node.is_leaf, node.keys, node.children, node.next, node.prev = state
+            if page_id in self._touched:
+                self._pool.put(page_id, node)
+
+    def flush(self):
+        self._pool.flush()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, self.page_size, self.order,
+                                      self._root_id, self._n_pages, self._free_head,
+                                      (self.key_type or "\0").encode(), (self.value_type or "\0").encode()))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Ganchos de armazenamento da BPlusTree
+    def _ref(self, node):
+        return node.page_id
+
+    def _load(self, ref):
+        if ref is None:
+            return None
+        return self._page(ref)
+
+    def _page(self, page_id):
+        node = self._pool.get(page_id)
+        if self._undo is not None and page_id not in self._undo:
+            # Cópia rasa, tirada antes de a operação mexer no nó
+            self._undo[page_id] = (node.is_leaf, node.keys[:], node.children[:], node.next, node.prev)
+        return node
+
+    def _new_node(self, is_leaf):
+        if self._free_head != NO_PAGE:
+            page_id = self._free_head
+            kind, _, self._free_head, _ = _PAGE.unpack_from(self._read_raw(page_id))
+            if kind != _FREE:
+                raise ValueError(f"Página {page_id} de {self.path} está na lista livre mas não está livre")
+        else:
+            page_id = self._n_pages
+            self._n_pages += 1
+        node = self._make_node(is_leaf)
+        node.page_id = page_id
+        if self._undo is not None:
+            self._undo.setdefault(page_id, None)
+        self._pool.put(page_id, node)
+        return node
+
+    def _dirty(self, node):
+        if self._touched is not None:
+            self._touched.add(node.page_id) # Conferido no fim da operação
+            self._encoded.pop(node.page_id, None)
+        else:
+            self._encoded[node.page_id] = self._check_size(self._encode(node)) # bulk_load: o nó já está completo
+        self._pool.put(node.page_id, node)
+
+    def _free(self, node):
+        # A página liberada entra no início da lista livre (encadeada no próprio arquivo)
+        self._pool.discard(node.page_id)
+        self._encoded.pop(node.page_id, None)
+        self._write_raw(node.page_id, _PAGE.pack(_FREE, 0, self._free_head, NO_PAGE))
+        self._free_head = node.page_id
+
+    # E/S de páginas
+    def _read_page(self, page_id):
+        page = self._read_raw(page_id)
+        try:
+            kind, count, next_page, prev_page = _PAGE.unpack_from(page)
+            if kind not in (_INTERNAL, _LEAF) or count > self.page_size:
+                raise ValueError(f"tipo {kind}, {count} chaves")
+            keys, offset = _unpack_values(page, _PAGE.size, count, self.key_type)
+            if kind == _LEAF:
+                children, _ = _unpack_values(page, offset, count, self.value_type)
+            else:
+                children = _from_bytes("q", page, offset, count + 1)[0].tolist()
+                if self.key_type is not None:
+                    keys = keys.tolist() # Nós internos guardam listas
+        except (struct.error, ValueError) as exc:
+            raise ValueError(f"Página {page_id} de {self.path} está corrompida") from exc
+        node = BPlusNode(self.order)
+        node.is_leaf = kind == _LEAF
+        node.keys = keys
+        node.children = children
+        node.next = None if next_page == NO_PAGE else next_page
+        node.prev = None if prev_page == NO_PAGE else prev_page
+        node.page_id = page_id
+        return node
+
+    def _write_page(self, page_id, node):
+        payload = self._encoded.pop(page_id, None)
+        self._write_raw(page_id, payload if payload is not None else self._encode(node))
+
+    def _encode(self, node):
+        refs = (NO_PAGE if ref is None else ref for ref in (node.next, node.prev))
+        out = bytearray(_PAGE.pack(_LEAF if node.is_leaf else _INTERNAL, len(node.keys), *refs))
+        _pack_values(node.keys, self.key_type, out)
+        if node.is_leaf:
+            _pack_values(node.children, self.value_type, out)
+        else:
+            out += _to_bytes(array("q", node.children))
+        return out
+
+    def _check_size(self, payload):
+        if len(payload) > self.page_size:
+            raise ValueError(f"Nó com {len(payload)} bytes não cabe em uma página de {self.page_size}; "
+                             "aumente page_size ou reduza a ordem")
+        return payload
+
+    def _read_raw(self, page_id):
+        if not 0 < page_id < self._n_pages:
+            raise ValueError(f"Página {page_id} fora de {self.path} ({self._n_pages} páginas)")
+        self._file.seek(page_id * self.page_size)
+        page = self._file.read(self.page_size)
+        if len(page) < _PAGE.size:
+            raise ValueError(f"Página {page_id} de {self.path} está truncada")
+        return page
+
+    def _write_raw(self, page_id, payload):
+        self._check_size(payload)
+        self._file.seek(page_id * self.page_size)
+        self._file.write(bytes(payload).ljust(self.page_size, b"\0"))
+
+
+# Codificação das chaves/valores de uma página. Com typecode, um array; sem ele,
+# uma seção que começa pelo tipo: b"N" (tudo None), b"q"/b"d" (todos int de 64
+# bits/float, em array), b"s" (todos str: tamanhos e depois os bytes UTF-8) ou
+# b"o" (misturados, cada valor com a sua marca; ver _pack_value).
+def _to_bytes(values):
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(code, page, offset, count):
+    values = array(code)
+    end = offset + count * values.itemsize
+    if end > len(page):
+        raise ValueError("página truncada")
+    values.frombytes(page[offset:end])
+    if _SWAP:
+        values.byteswap()
+    return values, end
+
+
+def _pack_values(values, code, out):
+    if code is not None:
+        out += _to_bytes(values if isinstance(values, array) and values.typecode == code else array(code, values))
+        return
+    kinds = set(map(type, values))
+    if kinds <= {type(None)}:
+        out += b"N"
+        return
+    if kinds == {int}:
+        try:
+            out += b"q" + _to_bytes(array("q", values))
+            return
+        except OverflowError:
+            pass # Algum int não cabe em 64 bits
+    elif kinds == {float}:
+        out += b"d" + _to_bytes(array("d", values))
+        return
+    elif kinds == {str}:
+        encoded = [value.encode() for value in values]
+        out += b"s" + _to_bytes(array("I", map(len, encoded))) + b"".join(encoded)
+        return
+    out += b"o"
+    for value in values:
+        _pack_value(value, out)
+
+
+def _unpack_values(page, offset, count, code):
+    if code is not None:
+        return _from_bytes(code, page, offset, count)
+    kind = page[offset:offset + 1]
+    offset += 1
+    if kind == b"N":
+        return [None] * count, offset
+    if kind in (b"q", b"d"):
+        values, offset = _from_bytes(kind.decode(), page, offset, count)
+        return values.tolist(), offset
+    if kind == b"s":
+        lengths, offset = _from_bytes("I", page, offset, count)
+        values = []
+        for length in lengths:
+            values.append(_slice(page, offset, length).decode())
+            offset += length
+        return values, offset
+    if kind == b"o":
+        values = []
+        for _ in range(count):
+            value, offset = _unpack_value(page, offset)
+            values.append(value)
+        return values, offset
+    raise ValueError(f"seção desconhecida {kind!r}")
+
+
+def _pack_value(value, out):
+    kind = type(value)
+    if value is None:
+        out += b"N"
+    elif kind is bool:
+        out += b"T" if value else b"F"
+    elif kind is int:
+        if -2**63 <= value < 2**63:
+            out += b"q" + _INT.pack(value)
+        else:
+            data = value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+            out += b"i" + _LENGTH.pack(len(data)) + data
+    elif kind is float:
+        out += b"d" + _FLOAT.pack(value)
+    elif kind is str:
+        data = value.encode()
+        out += b"s" + _LENGTH.pack(len(data)) + data
+    elif kind is bytes:
+        out += b"b" + _LENGTH.pack(len(value)) + value
+    elif kind is tuple:
+        out += b"t" + _LENGTH.pack(len(value))
+        for item in value:
+            _pack_value(item, out)
+    else:
+        raise TypeError(f"PagedBPlusTree sem typecode não guarda {kind.__name__}: "
+                        "use None, bool, int, float, str, bytes ou tuplas desses tipos")
+
+
+def _unpack_value(page, offset):
+    tag = page[offset:offset + 1]
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag in (b"T", b"F"):
+        return tag == b"T", offset
+    if tag == b"q":
+        return _INT.unpack_from(page, offset)[0], offset + _INT.size
+    if tag == b"d":
+        return _FLOAT.unpack_from(page, offset)[0], offset + _FLOAT.size
+    if tag == b"t":
+        (count,) = _LENGTH.unpack_from(page, offset)
+        offset += _LENGTH.size
+        items = []
+        for _ in range(count):
+            item, offset = _unpack_value(page, offset)
+            items.append(item)
+        return tuple(items), offset
+    if tag in (b"i", b"s", b"b"):
+        (length,) = _LENGTH.unpack_from(page, offset)
+        offset += _LENGTH.size
+        data = _slice(page, offset, length)
+        offset += length
+        if tag == b"i":
+            return int.from_bytes(data, "little", signed=True), offset
+        return (data.decode() if tag == b"s" else data), offset
+    raise ValueError(f"marca desconhecida {tag!r}")
+
+
+def _slice(page, offset, length):
+    if offset + length > len(page):
+        raise ValueError("página truncada")
+    return page[offset:offset + length]
@@ -7,93 +7,201 @@ class Node:
     self.left = None
     self.right = None
     self.height = 1 
+    self.size = 1 # Nós na subárvore (mantido pela AVLTree)
   
   def __str__(self):
     return str(self.data)
 
+  def copy(self):
+    node = Node(self.data)
+    node.left = self.left
+    node.right = self.right
+    node.height = self.height
+    node.size = self.size
+    return node
+
 class BinaryTree:
-  def __init__(self,data=None, node=None):
+  """
+  Com persistent=True a árvore não altera nós existentes: insert/remove copiam
+  só os nós do caminho modificado (O(log n) em árvores balanceadas) e trocam a
+  raiz, então versões antigas continuam válidas e imutáveis. snapshot() guarda
+  a versão atual em O(1), e outras threads podem percorrê-la sem locks.
+  """
+  def __init__(self,data=None, node=None, persistent=False):
+    self.persistent = persistent
     if node:
       self.root = node
+      self.size = sum(1 for _ in self.iter_preorder())
+      if persistent:
+        self._fill_sizes()
     elif data:
       node = Node(data)
       self.root = node
+      self.size = 1
     else:
       self.root = None
+      self.size = 0
+
+  # Percursos preguiçosos e sem recursão: geram os valores (node.data)
+  def iter_inorder(self, node=None):
+    stack = []
+    node = self.root if node is None else node
+    while stack or node:
+      while node:
+        stack.append(node)
+        node = node.left
+      node = stack.pop()
+      yield node.data
+      node = node.right
+
+  def iter_preorder(self, node=None):
+    node = self.root if node is None else node
+    stack = [node] if node else []
+    while stack:
+      node = stack.pop()
+      yield node.data
+      if node.right:
+        stack.append(node.right)
+      if node.left:
+        stack.append(node.left)
+
+  def iter_postorder(self, node=None):
+    node = self.root if node is None else node
+    stack = []
+    last = None
+    while stack or node:
+      while node:
+        stack.append(node)
+        node = node.left
+      top = stack[-1]
+      # Só visita o nó depois de terminar a subárvore direita
+      if top.right and top.right is not last:
+        node = top.right
+      else:
+        stack.pop()
+        yield top.data
+        last = top
+
+  def iter_levelorder(self, node=None):
+    node = self.root if node is None else node
+    q = deque([node] if node else [])
+    while q:
+      node = q.popleft()
+      yield node.data
+      if node.left:
+        q.append(node.left)
+      if node.right:
+        q.append(node.right)
+
+  def __iter__(self):
+    return self.iter_inorder()
+
+  def __len__(self):
+    return self.size
+
+  def snapshot(self):
+    """A versão atual, em O(1): uma árvore que compartilha todos os nós."""
+    if not self.persistent:
+      raise ValueError("snapshot() exige uma árvore persistente (persistent=True)")
+    # Só lê a raiz (uma atribuição atômica do escritor); o tamanho vem dela,
+    # pois árvores persistentes mantêm node.size nos caminhos copiados
+    root = self.root
+    tree = type(self)(persistent=True)
+    tree.root = root
+    tree.size = root.size if root else 0
+    return tree
+
+  def freeze(self, layout="eytzinger", dtype=None):
+    """
+    Compila os valores (numéricos) em uma FrozenTree imutável: arrays NumPy em
+    ordem de Eytzinger (layout="eytzinger") ou van Emde Boas (layout="veb").
+    A forma da árvore compilada é sempre a balanceada, qualquer que seja a desta.
+    """
+    from .frozen_tree import FrozenTree  # Importa aqui: NumPy só é exigido por freeze()
+    return FrozenTree.from_sorted(self.iter_inorder(), layout, dtype)
+
+  def _fill_sizes(self):
+    # Acerta node.size de baixo para cima, nível a nível
+    levels = [[self.root]]
+    while levels[-1]:
+      levels.append([child for n in levels[-1] for child in (n.left, n.right) if child])
+    for level in reversed(levels):
+      for n in level:
+        n.size = 1 + (n.left.size if n.left else 0) + (n.right.size if n.right else 0)
+
+  def _copy_path(self, path):
+    # Troca os nós de um caminho (da raiz para baixo) por cópias, religando
+    # cada cópia à cópia do filho; os nós originais não são tocados
+    copies = [node.copy() for node in path]
+    for i in range(1, len(path)):
+      if copies[i - 1].left is path[i]:
+        copies[i - 1].left = copies[i]
+      else:
+        copies[i - 1].right = copies[i]
+    return copies
 
   def inorder_traversal(self, node=None):
-    if node is None:
-      node = self.root
-    if node.left:
-      self.inorder_traversal(node.left)
-    print(node, end=' ')
-    if node.right:
-      self.inorder_traversal(node.right)
+    for data in self.iter_inorder(node):
+      print(data, end=' ')
 
   def postorder_traversal(self, node=None):
-    if node is None:
-      node = self.root
-    if node.left:
-      self.postorder_traversal(node.left)
-    if node.right:
-      self.postorder_traversal(node.right)
-    print(node)
+    for data in self.iter_postorder(node):
+      print(data)
 
   def levelorder_traversal(self, node=ROOT):
     if node == ROOT:
       node = self.root
-    q = deque()
-    q.append(self.root)
-
-    while q:
-        node = q.popleft()
-        print(node, end=' ')
-        if node.left:
-            q.append(node.left)
-        if node.right:
-            q.append(node.right)
+    for data in self.iter_levelorder(node):
+      print(data, end=' ')
 
 
   def height(self, node = None):
+    # Conta os níveis de uma busca em largura (sem recursão)
     if node is None:
       node = self.root
-    hleft = 0
-    hright = 0
-    if node.left:
-      hleft = self.height(node.left)
-    if node.right:
-      hright = self.height(node.right)
-    if hright > hleft:
-      return hright + 1
-    else:
-      return hleft + 1
+    level = [node] if node else []
+    height = 0
+    while level:
+      height += 1
+      level = [child for n in level for child in (n.left, n.right) if child]
+    return height
 
 class BinarySearchTree(BinaryTree):
   def insert(self, value):
-    parent = None
+    path = []
     x = self.root
     while(x): # Achando o 'pai' certo para o valor
-      parent = x
+      if value == x.data: # Valor repetido: nada a fazer
+        return
+      path.append(x)
       if value > x.data:
         x = x.right
       else:
         x = x.left
+    if self.persistent and path:
+      path = self._copy_path(path)
+      for node in path:
+        node.size += 1
+    parent = path[-1] if path else None
     if parent is None: # Caso em que a árvore está vazia
       self.root = Node(value)
     elif value < parent.data: # Caso em que value é menor que parent(esquerda)
       parent.left = Node(value)
-    elif value > parent.data: # Caso em que value é maior que parent(direita)
+    else: # Caso em que value é maior que parent(direita)
       parent.right = Node(value)
+    if self.persistent and path: # Publica a versão nova já pronta
+      self.root = path[0]
+    self.size += 1
 
-  def search(self, value, node = 0):
-    if node == 0:
-      node = self.root
-    if node is None or node.data == value:
-      return BinarySearchTree(node)
-    if value < node.data:
-      return self.search(value, node.left)
-    else:
-      return self.search(value, node.right)
+  def search(self, value):
+    """Retorna o nó com o valor (ou None), sem recursão e sem criar objetos."""
+    node = self.root
+    while node is not None and node.data != value:
+      node = node.left if value < node.data else node.right
+    return node
+
+  def __contains__(self, value):
+    return self.search(value) is not None
 
   def min(self, node=ROOT):
       if node == ROOT:
@@ -109,39 +217,45 @@ class BinarySearchTree(BinaryTree):
           node = node.right
       return node.data
 
-  def remove(self, value, node=ROOT):
-    if node == ROOT:
-      node = self.root
+  def remove(self, value):
+    # Acha o nó, guardando o caminho até ele
+    path = []
+    node = self.root
+    while node is not None and node.data != value:
+      path.append(node)
+      node = node.left if value < node.data else node.right
     if node is None:
-      return node
-    if value < node.data: # Buscando o valor na esquerda
-      node.left = self.remove(value, node.left)
-    elif value > node.data: # Buscando o valor na direita
-      node.right = self.remove(value, node.right)
-    # Recursividade onde se o valor ainda for menor do que
-    # o valor do nó, todo aquele nó irá ser substituido pelo
-    # que a função retornar na proxima recursão.
-    # Isso ocorre até achar o caso do número ser igual.
-
-    else: # Achamos o valor, agora ocorre o tratamento
-    # Aqui se vê o caso 1 e 2:
-    #1. O nó não tem filhos (node.left and node.right is None)
-    #2. O nó tem filho de só um lado
-      if node.left is None:
-        return node.right
-      elif node.right is None:
-        return node.left
-    # O que acontece então é que estamos no nível da recursão em que
-    # estamos no node.left ou node.right do parente do nó em que se
-    # encontra o nosso valor. Então o atual node = node.right or
-    # node.left do parente. Então procuramos o caso em que se encaixa
-    # o nó e retornamos o novo valor que se deve encontrar o novo
-    # node.right ou node.left do node.right ou node.left do parent do nó.
-      else:
-    # Aqui se vê o caso 3: O nó tem ambos os filhos não-vaziozs.
-        substitute = self.min(node.right) # Achando o substituto
-        # que deve ser o sucessor mais proximo do valor
-        node.data = substitute
-        node.right = self.remove(substitute, node.right)
-    return node # Caso em que eu nao altero nada na estrutura
+      return
+
+    # Caso 3: O nó tem ambos os filhos não-vazios. Copiamos o sucessor
+    # (o menor da subárvore direita) para o nó e removemos o sucessor,
+    # que não tem filho à esquerda (cai nos casos 1 ou 2).
+    target = node
+    if node.left and node.right:
+      depth = len(path)
+      path.append(node)
+      target = node.right
+      while target.left:
+        path.append(target)
+        target = target.left
+    if self.persistent and path:
+      path = self._copy_path(path)
+      for ancestor in path:
+        ancestor.size -= 1
+    if target is not node:
+      path[depth].data = target.data
+    node = target
 
+    # Casos 1 e 2: nenhum filho ou filho de só um lado; o filho (ou None)
+    # ocupa o lugar do nó no pai
+    parent = path[-1] if path else None
+    child = node.left if node.left else node.right
+    if parent is None:
+      self.root = child
+    elif parent.left is node:
+      parent.left = child
+    else:
+      parent.right = child
+    if self.persistent and path:
+      self.root = path[0]
+    self.size -= 1
@@ -0,0 +1,388 @@
+from abc import ABC, abstractmethod
+from array import array
+
+from .hash_table import HashTable
+
+_MASK64 = (1 << 64) - 1
+
+
+class CacheNode:
+    def __init__(self, key, value, weight):
+        self.key = key
+        self.value = value
+        self.weight = weight
+        self.prev = None  # Lista duplamente encadeada intrusiva: o nó é o próprio elo
+        self.next = None
+        self.owner = None  # Lista (ou balde de frequência / segmento) onde o nó está
+
+
+class _LinkedList:
+    """Lista duplamente encadeada circular com sentinela; a frente é o mais recente."""
+    def __init__(self):
+        self.root = CacheNode(None, None, 0)
+        self.root.prev = self.root.next = self.root
+        self.size = 0
+        self.weight = 0
+
+    def push_front(self, node):
+        self.insert_after(self.root, node)
+
+    def insert_after(self, ref, node):
+        node.prev = ref
+        node.next = ref.next
+        ref.next.prev = node
+        ref.next = node
+        node.owner = self
+        self.size += 1
+        self.weight += node.weight
+
+    def unlink(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = node.owner = None
+        self.size -= 1
+        self.weight -= node.weight
+
+    def move_to_front(self, node):
+        self.unlink(node)
+        self.push_front(node)
+
+    def back(self):
+        return self.root.prev if self.size else None
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        curr = self.root.next
+        while curr is not self.root:
+            yield curr
+            curr = curr.next
+
+
+class _Cache(ABC):
+    """
+    Base das caches: um HashTable de chave -> CacheNode dá acesso O(1) ao nó,
+    e cada política decide a ordem de despejo movendo os nós entre listas.
+    capacity limita a soma dos pesos; sem 'weigher' cada entrada pesa 1
+    (limite por quantidade). weigher(chave, valor) devolve o peso da entrada.
+    """
+    def __init__(self, capacity, weigher=None):
+        if capacity < 1:
+            raise ValueError("capacity deve ser >= 1")
+        self.capacity = capacity
+        self.weigher = weigher
+        self.index = HashTable(capacity=16)
+        self.weight = 0  # Soma dos pesos das entradas guardadas
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _weigh(self, key, value):
+        return 1 if self.weigher is None else self.weigher(key, value)
+
+    def get(self, key, default=None):
+        node = self.index.search(key)
+        if node is None:
+            self.misses += 1
+            self._on_miss(key)
+            return default
+        self.hits += 1
+        self._on_hit(node)
+        return node.value
+
+    def put(self, key, value):
+        weight = self._weigh(key, value)
+        node = self.index.search(key)
+        if weight > self.capacity:
+            # Nunca caberia: não entra (e uma versão antiga da chave sai)
+            if node is not None:
+                self._discard(node)
+            return
+        if node is not None:
+            # Atualização: troca o valor e reajusta o peso da lista que guarda o nó
+            node.value = value
+            node.owner.weight += weight - node.weight
+            self.weight += weight - node.weight
+            node.weight = weight
+            self._on_hit(node)
+        else:
+            node = CacheNode(key, value, weight)
+            self.index.insert(key, node)
+            self.weight += weight
+            self._on_insert(node)
+        self._evict(node)
+
+    def remove(self, key):
+        node = self.index.search(key)
+        if node is not None:
+            self._discard(node)
+
+    def _discard(self, node):
+        if node.owner is not None:
+            node.owner.unlink(node)
+        self.index.remove(node.key)
+        self.weight -= node.weight
+
+    def _evict_node(self, node):
+        self._discard(node)
+        self.evictions += 1
+
+    def __contains__(self, key):
+        # Não conta como acesso (não altera contadores nem a ordem)
+        return self.index.search(key) is not None
+
+    def __len__(self):
+        return self.index.size
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "weight": self.weight,
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def check_invariants(self):
+        """
+        Verifica o peso total (<= capacity e igual à soma das listas), o tamanho e o
+        peso de cada lista, o dono de cada nó e o índice.
+        Lança AssertionError no primeiro problema encontrado; retorna o total de entradas.
+        """
+        assert self.weight <= self.capacity, f"peso {self.weight} acima da capacidade {self.capacity}"
+        count = weight = 0
+        for name, items in self.segments():
+            nodes = list(items)
+            assert len(nodes) == items.size, f"{name}: tamanho {items.size}, mas {len(nodes)} nós"
+            assert sum(node.weight for node in nodes) == items.weight, f"{name}: peso da lista desatualizado"
+            for node in nodes:
+                assert node.owner is items, f"{name}: nó {node.key!r} com dono errado"
+                assert self.index.search(node.key) is node, f"nó {node.key!r} fora do índice"
+            count += len(nodes)
+            weight += items.weight
+        assert count == len(self), f"{count} nós nas listas e {len(self)} no índice"
+        assert weight == self.weight, f"peso {self.weight}, mas as listas somam {weight}"
+        return count
+
+    # Ganchos de cada política
+    @abstractmethod
+    def _on_hit(self, node):
+        """Acesso (get ou atualização por put) a uma entrada presente."""
+
+    def _on_miss(self, key):
+        pass
+
+    @abstractmethod
+    def _on_insert(self, node):
+        """Coloca uma entrada nova na estrutura da política."""
+
+    @abstractmethod
+    def _evict(self, keep):
+        """Despeja até o peso caber; 'keep' (a entrada recém-gravada por put) não é vítima."""
+
+    @abstractmethod
+    def segments(self):
+        """Lista de (nome, lista de nós) na ordem de despejo, usada pelo visualizador."""
+
+
+class LRUCache(_Cache):
+    """Despeja a entrada usada há mais tempo. get/put/despejo em O(1)."""
+    def __init__(self, capacity, weigher=None):
+        super().__init__(capacity, weigher)
+        self.order = _LinkedList()
+
+    def _on_hit(self, node):
+        self.order.move_to_front(node)
+
+    def _on_insert(self, node):
+        self.order.push_front(node)
+
+    def _evict(self, keep):
+        # A entrada recém-gravada está na frente: só seria a última se estivesse sozinha
+        while self.weight > self.capacity:
+            self._evict_node(self.order.back())
+
+    def segments(self):
+        return [("LRU", self.order)]
+
+
+class _FrequencyBucket(CacheNode):
+    """Balde com todas as entradas de uma mesma frequência (elo da lista de baldes)."""
+    def __init__(self, freq):
+        super().__init__(None, None, 0)
+        self.freq = freq
+        self.items = _LinkedList()
+        self.items.bucket = self
+
+
+class LFUCache(_Cache):
+    """
+    Despeja a entrada menos usada; empates saem pela menos recente.
+    Os baldes de frequência formam uma lista em ordem crescente, e cada balde
+    tem a sua lista de entradas, então subir de frequência e despejar são O(1).
+    """
+    def __init__(self, capacity, weigher=None):
+        super().__init__(capacity, weigher)
+        self.buckets = _LinkedList()
+
+    def _on_hit(self, node):
+        bucket = node.owner.bucket
+        target = bucket.next
+        if target is self.buckets.root or target.freq != bucket.freq + 1:
+            target = _FrequencyBucket(bucket.freq + 1)
+            self.buckets.insert_after(bucket, target)
+        self._unlink(node)
+        target.items.push_front(node)
+
+    def _on_insert(self, node):
+        first = self.buckets.root.next
+        if first is self.buckets.root or first.freq != 1:
+            first = _FrequencyBucket(1)
+            self.buckets.push_front(first)
+        first.items.push_front(node)
+
+    def _unlink(self, node):
+        # Tira o nó do seu balde e descarta o balde se ele ficar vazio
+        items = node.owner
+        items.unlink(node)
+        if not items.size:
+            self.buckets.unlink(items.bucket)
+
+    def _discard(self, node):
+        self._unlink(node)
+        self.index.remove(node.key)
+        self.weight -= node.weight
+
+    def _evict(self, keep):
+        # A entrada recém-gravada fica na frente do seu balde; se ela for a única
+        # do balde de menor frequência, a vítima sai do balde seguinte
+        while self.weight > self.capacity:
+            bucket = self.buckets.root.next
+            victim = bucket.items.back()
+            if victim is keep:
+                victim = bucket.next.items.back()
+            self._evict_node(victim)
+
+    def segments(self):
+        return [(f"freq={bucket.freq}", bucket.items) for bucket in self.buckets]
+
+
+class CountMinSketch:
+    """
+    Estimador de frequência aproximada (Count-Min) com contadores de 4 bits
+    (saturam em 15). A cada 'sample_size' incrementos todos os contadores são
+    divididos por dois, para que acessos antigos percam peso.
+    """
+    def __init__(self, width, depth=4, sample_size=None):
+        size = 1
+        while size < width:
+            size *= 2
+        self.width = size
+        self._bits = size.bit_length() - 1
+        self.depth = depth
+        self.table = array('B', bytes(size * depth))
+        self.sample_size = sample_size if sample_size is not None else 10 * size
+        self.additions = 0
+        # Multiplicadores ímpares distintos: um hash multiplicativo por linha
+        self._seeds = [(0x9E3779B97F4A7C15 * (2 * row + 1)) & _MASK64 for row in range(depth)]
+
+    def _slots(self, key):
+        h = hash(key) & _MASK64
+        shift = 64 - self._bits
+        for row, seed in enumerate(self._seeds):
+            yield row * self.width + ((((h ^ (h >> 29)) * seed) & _MASK64) >> shift)
+
+    def increment(self, key):
+        table = self.table
+        for slot in self._slots(key):
+            if table[slot] < 15:
+                table[slot] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key):
+        return min(self.table[slot] for slot in self._slots(key))
+
+    def _reset(self):
+        self.table = array('B', (count >> 1 for count in self.table))
+        self.additions //= 2
+
+
+class WTinyLFUCache(_Cache):
+    """
+    W-TinyLFU: uma pequena janela LRU recebe as entradas novas; quem sai da janela
+    só entra na área principal (SLRU: probatória + protegida) se a sua frequência
+    estimada pelo CountMinSketch for maior que a da vítima da área principal.
+    Assim rajadas de chaves acessadas uma única vez não expulsam as populares.
+    """
+    def __init__(self, capacity, weigher=None, window_ratio=0.01, protected_ratio=0.8):
+        if capacity < 2:
+            raise ValueError("capacity deve ser >= 2 (uma unidade para a janela e uma para a área principal)")
+        super().__init__(capacity, weigher)
+        # Janela e área principal somam exatamente 'capacity', com pelo menos 1 cada
+        self.window_capacity = min(max(1, int(capacity * window_ratio)), capacity - 1)
+        self.main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+        self.window = _LinkedList()
+        self.probation = _LinkedList()
+        self.protected = _LinkedList()
+        self.sketch = CountMinSketch(capacity)
+
+    def get(self, key, default=None):
+        self.sketch.increment(key)
+        return super().get(key, default)
+
+    def put(self, key, value):
+        self.sketch.increment(key)
+        super().put(key, value)
+
+    def _on_hit(self, node):
+        if node.owner is self.probation:
+            # Segundo acesso na área principal: promove para a protegida
+            self.probation.unlink(node)
+            self.protected.push_front(node)
+            while self.protected.weight > self.protected_capacity and len(self.protected) > 1:
+                demoted = self.protected.back()
+                self.protected.unlink(demoted)
+                self.probation.push_front(demoted)
+        else:
+            node.owner.move_to_front(node)
+
+    def _on_insert(self, node):
+        self.window.push_front(node)
+
+    def _evict(self, keep):
+        # A entrada nova passa pela admissão como qualquer candidata da janela
+        while self.window.weight > self.window_capacity:
+            candidate = self.window.back()
+            self.window.unlink(candidate)
+            self._admit(candidate)
+        # Uma atualização que aumentou o peso pode estourar a área principal
+        while self.probation.weight + self.protected.weight > self.main_capacity:
+            self._evict_node(self.probation.back() or self.protected.back())
+
+    def _admit(self, candidate):
+        # A candidata entra na probatória se couber; senão disputa com as vítimas
+        while self.probation.weight + self.protected.weight + candidate.weight > self.main_capacity:
+            victim = self.probation.back() or self.protected.back()
+            if (victim is None or candidate.weight > self.main_capacity
+                    or self.sketch.estimate(candidate.key) <= self.sketch.estimate(victim.key)):
+                self._evict_node(candidate)
+                return
+            self._evict_node(victim)
+        self.probation.push_front(candidate)
+
+    def segments(self):
+        return [("janela", self.window), ("probatória", self.probation), ("protegida", self.protected)]
+
+    def check_invariants(self):
+        count = super().check_invariants()
+        assert self.window.weight <= self.window_capacity, f"janela com peso {self.window.weight}"
+        main = self.probation.weight + self.protected.weight
+        assert main <= self.main_capacity, f"área principal com peso {main}"
+        return count
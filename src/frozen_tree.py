@@ -0,0 +1,283 @@
+import mmap
+import operator
+import struct
+
+import numpy as np
+
+_LAYOUTS = ("eytzinger", "veb")
+_FROZEN_MAGIC = b"FBT1"
+# magic, marcador de ordem dos bytes, layout, nº de valores, dtype das chaves
+# (com preenchimento para os arrays começarem alinhados a 8 bytes)
+_FROZEN_HEADER = struct.Struct("=4sIB7xQ8s")
+_BYTE_ORDER_MARK = 0x01020304
+
+
+class FrozenTree:
+    """
+    Árvore de busca somente leitura compilada em arrays NumPy (imutáveis), para
+    tabelas de consulta que quase não mudam: em vez de seguir ponteiros entre
+    objetos Node, a busca anda por índices em um vetor contíguo.
+
+    Os slots são numerados a partir de 1; o slot 0 significa "nenhum".
+    - layout="eytzinger": a árvore completa em ordem de nível (BFS), com os
+      filhos de k em 2k e 2k+1. A descida não tem desvios
+      (k = 2k + (keys[k] < x)) e os primeiros níveis, os mais visitados,
+      ficam juntos no início do vetor.
+    - layout="veb": van Emde Boas. A árvore é cortada na metade da altura e
+      cada pedaço é gravado recursivamente em um bloco contíguo, então uma
+      busca toca O(log_B n) blocos de memória para qualquer tamanho de bloco B.
+      Os filhos ficam nos arrays left/right.
+    ranks[k] é a posição do valor do slot k na ordem crescente (ranks[0] = n),
+    o que dá lower_bound, rank e count_range sem percorrer a árvore.
+    """
+    def __init__(self, keys, ranks, layout="eytzinger", left=None, right=None, mapping=None):
+        if layout not in _LAYOUTS:
+            raise ValueError(f"layout deve ser um de {_LAYOUTS}")
+        self.layout = layout
+        self.keys = keys
+        self.ranks = ranks
+        self.left = left
+        self.right = right
+        self.size = len(keys) - 1
+        self.depth = self.size.bit_length()  # Altura das duas formas de árvore
+        for part in (keys, ranks, left, right):
+            if part is not None and part.flags.writeable:
+                part.flags.writeable = False
+        # Nas buscas de um valor só, indexar um memoryview devolve int/float
+        # do Python direto, bem mais rápido que criar escalares NumPy a cada passo
+        self._views = [memoryview(part) if part is not None else None for part in (keys, left, right)]
+        self._mapping = mapping
+
+    @classmethod
+    def from_sorted(cls, values, layout="eytzinger", dtype=None):
+        """Compila valores numéricos em ordem estritamente crescente."""
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=dtype)
+        if values.dtype.kind not in "iuf":
+            raise TypeError(f"FrozenTree só guarda valores numéricos (dtype {values.dtype})")
+        if values.ndim != 1:
+            raise ValueError("valores precisam formar um vetor")
+        if len(values) > 1 and not np.all(values[1:] > values[:-1]):
+            raise ValueError("valores precisam estar em ordem estritamente crescente")
+        n = len(values)
+        if layout == "eytzinger":
+            ranks = _eytzinger_ranks(n)
+            left = right = None
+        elif layout == "veb":
+            ranks, left, right = _veb_layout(n)
+        else:
+            raise ValueError(f"layout deve ser um de {_LAYOUTS}")
+        keys = np.empty(n + 1, dtype=values.dtype)
+        keys[0] = 0  # Slot 0 não é usado nas comparações que contam
+        keys[1:] = values[ranks[1:]]
+        return cls(keys, ranks, layout, left, right)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        values = np.empty(self.size, dtype=self.keys.dtype)
+        values[self.ranks[1:]] = self.keys[1:]
+        return iter(values.tolist())
+
+    def __contains__(self, value):
+        return self.search(value)
+
+    # Consultas de um valor
+    def _slot(self, value, strict):
+        # Slot do primeiro valor >= value (ou > value, se strict); 0 se não há
+        keys, left, right = self._views
+        before = operator.le if strict else operator.lt
+        if self.layout == "eytzinger":
+            n = self.size
+            k = 1
+            while k <= n:
+                k = 2 * k + before(keys[k], value)
+            # Desfaz as descidas à direita do fim: remove os 1s finais e mais um bit
+            return k >> ((~k & (k + 1)).bit_length())
+        k = 1 if self.size else 0
+        best = 0
+        while k:
+            if before(keys[k], value):
+                k = right[k]
+            else:
+                best = k
+                k = left[k]
+        return best
+
+    def search(self, value):
+        slot = self._slot(value, strict=False)
+        return slot != 0 and self._views[0][slot] == value
+
+    def lower_bound(self, value):
+        """O menor valor >= value (ou None)."""
+        slot = self._slot(value, strict=False)
+        return self._views[0][slot] if slot else None
+
+    def rank(self, value):
+        """Quantidade de valores menores que 'value'."""
+        return int(self.ranks[self._slot(value, strict=False)])
+
+    def count_range(self, lo, hi):
+        """Quantidade de valores v com lo <= v <= hi (como em AVLTree.count_range)."""
+        if hi < lo:
+            return 0
+        return int(self.ranks[self._slot(hi, strict=True)] - self.ranks[self._slot(lo, strict=False)])
+
+    # Consultas em lote: todas as consultas descem juntas, um nível por rodada
+    def _slots(self, queries, strict):
+        keys = self.keys
+        before = np.less_equal if strict else np.less
+        k = np.ones(len(queries), dtype=np.int64)
+        if self.layout == "eytzinger":
+            n = self.size
+            for _ in range(self.depth):
+                inside = k <= n
+                step = before(keys[np.where(inside, k, 0)], queries)
+                k = np.where(inside, 2 * k + step, k)
+            return k // (2 * (~k & (k + 1)))
+        best = np.zeros(len(queries), dtype=np.int64)
+        for _ in range(self.depth):
+            go_right = before(keys[k], queries)
+            best = np.where((k != 0) & ~go_right, k, best)
+            k = np.where(go_right, self.right[k], self.left[k])
+        return best
+
+    def _queries(self, queries):
+        return np.asarray(queries, dtype=np.result_type(self.keys.dtype, np.asarray(queries).dtype))
+
+    def search_many(self, queries):
+        """Vetor booleano: se cada consulta está na árvore."""
+        queries = self._queries(queries)
+        slots = self._slots(queries, strict=False)
+        return (slots != 0) & (self.keys[slots] == queries)
+
+    def rank_many(self, queries):
+        """rank() de cada consulta (como np.searchsorted sobre os valores ordenados)."""
+        return self.ranks[self._slots(self._queries(queries), strict=False)]
+
+    def count_range_many(self, lo, hi):
+        lo, hi = self._queries(lo), self._queries(hi)
+        counts = self.ranks[self._slots(hi, strict=True)] - self.ranks[self._slots(lo, strict=False)]
+        return np.maximum(counts, 0)
+
+    # Serialização: pickle (pelos arrays) ou arquivo binário mapeado com mmap
+    def __reduce__(self):
+        return (type(self), (self.keys, self.ranks, self.layout, self.left, self.right))
+
+    def save(self, path):
+        layout = _LAYOUTS.index(self.layout)
+        dtype = self.keys.dtype.str.encode()
+        with open(path, "wb") as f:
+            f.write(_FROZEN_HEADER.pack(_FROZEN_MAGIC, _BYTE_ORDER_MARK, layout, self.size, dtype))
+            for part in (self.keys, self.ranks, self.left, self.right):
+                if part is not None:
+                    f.write(part.tobytes())
+                    f.write(bytes(-part.nbytes % 8))  # Mantém o próximo array alinhado
+
+    @classmethod
+    def load(cls, path):
+        """Abre um arquivo de save() com mmap; os arrays apontam direto para o mapeamento."""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, mark, layout, size, dtype = _FROZEN_HEADER.unpack_from(mapping)
+        if magic != _FROZEN_MAGIC or mark != _BYTE_ORDER_MARK:
+            mapping.close()
+            raise ValueError(f"{path} não é uma FrozenTree desta plataforma")
+        layout = _LAYOUTS[layout]
+        offset = _FROZEN_HEADER.size
+        parts = []
+        for part_dtype in (dtype.rstrip(b"\0").decode(), np.int64) + ((np.int64, np.int64) if layout == "veb" else ()):
+            parts.append(np.frombuffer(mapping, dtype=part_dtype, count=size + 1, offset=offset))
+            offset += parts[-1].nbytes + (-parts[-1].nbytes % 8)
+        keys, ranks, *children = parts
+        return cls(keys, ranks, layout, *children, mapping=mapping)
+
+    def close(self):
+        """Libera o mapeamento de uma FrozenTree carregada com load()."""
+        if self._mapping is None:
+            return
+        for view in self._views:
+            if view is not None:
+                view.release()
+        # Os arrays apontam para o mapeamento: precisam sumir antes de fechá-lo
+        self.keys = self.ranks = self.left = self.right = self._views = None
+        self._mapping.close()
+        self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _eytzinger_ranks(n):
+    # ranks[k] = posição em ordem do slot k, visitando os índices 1..n em ordem
+    # simétrica (esquerda, nó, direita) sem recursão
+    ranks = np.empty(n + 1, dtype=np.int64)
+    ranks[0] = n
+    order = []
+    stack = []
+    k = 1
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k *= 2
+        k = stack.pop()
+        order.append(k)
+        k = 2 * k + 1
+    ranks[order] = np.arange(n)
+    return ranks
+
+
+def _veb_layout(n):
+    # A forma é a da árvore balanceada pelo meio (a de AVLTree.from_sorted):
+    # o nó do intervalo [lo, hi) de posições é a do meio, (lo + hi) // 2
+    order = []  # Posições em ordem de vEB
+
+    def children(ranges):
+        out = []
+        for lo, hi in ranges:
+            mid = (lo + hi) // 2
+            if lo < mid:
+                out.append((lo, mid))
+            if mid + 1 < hi:
+                out.append((mid + 1, hi))
+        return out
+
+    def emit(lo, hi, height):
+        # Grava as 'height' primeiras camadas da subárvore [lo, hi): a metade de
+        # cima, e depois cada subárvore pendurada nela, todas recursivamente
+        if height == 1:
+            order.append((lo + hi) // 2)
+            return
+        top = height // 2
+        emit(lo, hi, top)
+        level = [(lo, hi)]
+        for _ in range(top):
+            level = children(level)
+        for sub_lo, sub_hi in level:
+            emit(sub_lo, sub_hi, height - top)
+
+    if n:
+        emit(0, n, n.bit_length())
+    ranks = np.empty(n + 1, dtype=np.int64)
+    ranks[0] = n
+    ranks[1:] = order
+    slot_of = np.empty(n, dtype=np.int64)
+    slot_of[ranks[1:]] = np.arange(1, n + 1)
+
+    left = np.zeros(n + 1, dtype=np.int64)
+    right = np.zeros(n + 1, dtype=np.int64)
+    stack = [(0, n)] if n else []
+    while stack:
+        lo, hi = stack.pop()
+        mid = (lo + hi) // 2
+        slot = slot_of[mid]
+        if lo < mid:
+            left[slot] = slot_of[(lo + mid) // 2]
+            stack.append((lo, mid))
+        if mid + 1 < hi:
+            right[slot] = slot_of[(mid + 1 + hi) // 2]
+            stack.append((mid + 1, hi))
+    return ranks, left, right
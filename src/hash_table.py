@@ -1,18 +1,93 @@
+import random
+from array import array
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Estratégias de hash para HashTable(hash_function=...): recebem a chave e devolvem um int.
+# Com o atributo top_bits=True o int é tratado como 64 bits e o bucket sai dos bits altos.
+def multiplicative_hash(key):
+    """
+    Hashing multiplicativo (Fibonacci): hash(key) * 2^64/φ módulo 2^64. Os bits altos
+    do produto dependem de todos os bits da chave, e é deles que o HashTable tira o
+    bucket; assim chaves sequenciais ou com padrão nos bits baixos se espalham.
+    """
+    return (hash(key) * _GOLDEN) & _MASK64
+
+multiplicative_hash.top_bits = True
+
+class SaltedHash:
+    """hash() combinado com um sal aleatório, para que um atacante não preveja as colisões."""
+    def __init__(self, salt=None):
+        self.salt = random.getrandbits(64) if salt is None else salt
+
+    def __call__(self, key):
+        return hash((self.salt, key))
+
+class TabulationHash:
+    """Tabulation hashing: XOR de tabelas aleatórias indexadas por cada byte de hash(key)."""
+    def __init__(self, seed=None):
+        rnd = random.Random(seed)
+        self.tables = [[rnd.getrandbits(64) for _ in range(256)] for _ in range(8)]
+
+    def __call__(self, key):
+        h = hash(key) & _MASK64
+        result = 0
+        for table in self.tables:
+            result ^= table[h & 0xFF]
+            h >>= 8
+        return result
+
 class HashNode:
     def __init__(self, key, value):
         self.key = key
         self.value = value
         self.next = None  # Aponta para o próximo nó em caso de colisão
 class HashTable:
-    def __init__(self, capacity=10):
+    def __init__(self, capacity=10, max_load_factor=0.75, min_load_factor=0.1, rehash_step=4,
+                 hash_function=None):
         self.capacity = capacity
         self.table = [None] * capacity
         self.size = 0
+        # Redimensionamento: cresce quando size/capacity passa de max_load_factor e
+        # encolhe abaixo de min_load_factor. max_load_factor=None desativa.
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.rehash_step = rehash_step  # Buckets migrados por operação durante um rehash
+        self.hash_function = hash_function if hash_function is not None else hash
+        self._top_bits = getattr(self.hash_function, "top_bits", False)
+        self.resizes = 0
+        # Contadores de buscas (search) e de nós visitados nelas
+        self.hits = 0
+        self.misses = 0
+        self.hit_probes = 0
+        self.miss_probes = 0
+        self._min_capacity = capacity
+        # Rehash incremental: a tabela antiga convive com a nova até ser toda migrada
+        self._old_table = None
+        self._old_capacity = 0
+        self._migrate_pos = 0
+
+    def _index(self, key, capacity):
+        h = self.hash_function(key)
+        if self._top_bits:
+            # Escala os 64 bits para [0, capacity): em potência de dois, são os log2(capacity) bits de cima
+            return (h * capacity) >> 64
+        if capacity & (capacity - 1) == 0:
+            return h & (capacity - 1)  # Potência de dois: máscara em vez de módulo
+        return h % capacity
 
     def _hash(self, key):
-        return hash(key) % self.capacity
+        return self._index(key, self.capacity)
 
     def insert(self, key, value):
+        self._rehash_step()
+
+        # Durante um rehash a chave pode estar em um bucket ainda não migrado
+        old, _ = self._find_old(key)
+        if old is not None:
+            old.value = value
+            return
 
         index = self._hash(key)
         node = self.table[index]
@@ -21,6 +96,7 @@ class HashTable:
         if node is None:
             self.table[index] = HashNode(key, value)
             self.size += 1
+            self._maybe_resize()
             return
 
         # Caso 2: Colisão ou Atualização. Percorre a lista encadeada.
@@ -35,21 +111,42 @@ class HashTable:
 
         prev.next = HashNode(key, value)
         self.size += 1
+        self._maybe_resize()
 
     def search(self, key):
+        self._rehash_step()
+        old, probes = self._find_old(key)
+        if old is not None:
+            self.hits += 1
+            self.hit_probes += probes
+            return old.value
+
         index = self._hash(key)
         curr = self.table[index]
 
         while curr is not None:
+            probes += 1
             if curr.key == key:
+                self.hits += 1
+                self.hit_probes += probes
                 return curr.value
             curr = curr.next
-        
+
+        self.misses += 1
+        self.miss_probes += probes
         return None
 
     def remove(self, key):
-        index = self._hash(key)
-        curr = self.table[index]
+        self._rehash_step()
+        if self._old_table is not None:
+            if self._unlink(self._old_table, self._index(key, self._old_capacity), key):
+                self._maybe_resize()
+                return
+        if self._unlink(self.table, self._hash(key), key):
+            self._maybe_resize()
+
+    def _unlink(self, table, index, key):
+        curr = table[index]
         prev = None
 
         while curr is not None:
@@ -57,13 +154,211 @@ class HashTable:
                 # Achou o nó para remover
                 if prev is None:
                     # O nó a ser removido é o primeiro da lista (cabeça)
-                    self.table[index] = curr.next
+                    table[index] = curr.next
                 else:
                     # O nó está no meio ou fim
                     prev.next = curr.next
-                
+
                 self.size -= 1
-                return           
+                return True
             # Avança os ponteiros
             prev = curr
             curr = curr.next
+        return False
+
+    def _find_old(self, key):
+        # Devolve (nó ou None, nós visitados) na tabela antiga
+        if self._old_table is None:
+            return None, 0
+        probes = 0
+        curr = self._old_table[self._index(key, self._old_capacity)]
+        while curr is not None:
+            probes += 1
+            if curr.key == key:
+                return curr, probes
+            curr = curr.next
+        return None, probes
+
+    def stats(self):
+        """
+        Estatísticas da tabela. Os contadores de busca são mantidos a cada operação;
+        o histograma de tamanho das cadeias ({tamanho: nº de buckets}) é montado
+        aqui, percorrendo os buckets.
+        """
+        histogram = {}
+        # Durante um rehash, entram também os buckets antigos ainda não migrados
+        pending = self._old_table[self._migrate_pos:] if self._old_table is not None else []
+        for table in (self.table, pending):
+            for curr in table:
+                length = 0
+                while curr is not None:
+                    length += 1
+                    curr = curr.next
+                histogram[length] = histogram.get(length, 0) + 1
+        used = [(length, count) for length, count in histogram.items() if length]
+        used_buckets = sum(count for _, count in used)
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "chain_length_histogram": dict(sorted(histogram.items())),
+            "max_chain_length": max((length for length, _ in used), default=0),
+            "mean_chain_length": self.size / used_buckets if used_buckets else 0.0,
+            "successful_lookups": self.hits,
+            "failed_lookups": self.misses,
+            "avg_probes_hit": self.hit_probes / self.hits if self.hits else 0.0,
+            "avg_probes_miss": self.miss_probes / self.misses if self.misses else 0.0,
+            "resizes": self.resizes,
+            "rehashing": self._old_table is not None,
+        }
+
+    def _maybe_resize(self):
+        if self.max_load_factor is None or self._old_table is not None:
+            return
+        if self.size > self.max_load_factor * self.capacity:
+            # Próxima potência de dois que pelo menos dobra a capacidade
+            new_capacity = 1
+            while new_capacity < 2 * self.capacity:
+                new_capacity *= 2
+            self._start_rehash(new_capacity)
+        elif (self.min_load_factor and self.capacity > self._min_capacity
+              and self.size < self.min_load_factor * self.capacity):
+            self._start_rehash(max(self._min_capacity, self.capacity // 2))
+
+    def _start_rehash(self, new_capacity):
+        self._old_table = self.table
+        self._old_capacity = self.capacity
+        self._migrate_pos = 0
+        self.table = [None] * new_capacity
+        self.capacity = new_capacity
+        self.resizes += 1
+
+    def _rehash_step(self):
+        """Migra alguns buckets da tabela antiga, espalhando o custo do rehash entre as operações."""
+        if self._old_table is None:
+            return
+        end = min(self._migrate_pos + self.rehash_step, self._old_capacity)
+        for i in range(self._migrate_pos, end):
+            curr = self._old_table[i]
+            while curr is not None:
+                # Reaproveita os nós: só troca os ponteiros
+                nxt = curr.next
+                index = self._hash(curr.key)
+                curr.next = self.table[index]
+                self.table[index] = curr
+                curr = nxt
+            self._old_table[i] = None
+        self._migrate_pos = end
+        if end == self._old_capacity:
+            self._old_table = None
+            self._old_capacity = 0
+
+
+_EMPTY = object()  # Marca de slot livre no endereçamento aberto
+
+class OpenAddressingHashTable:
+    """
+    Tabela hash com endereçamento aberto (sondagem linear com Robin Hood).
+    Hashes, chaves e valores ficam em três arrays paralelos, sem um objeto por
+    entrada; o hash de cada chave é guardado para não chamar hash() de novo nas
+    comparações nem no redimensionamento. Remoção por deslocamento para trás
+    (backward shift), sem lápides. Mesma API da HashTable (insert/search/remove).
+    """
+    def __init__(self, capacity=16, max_load_factor=0.85):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.capacity = size
+        self.max_load_factor = max_load_factor
+        self.size = 0
+        self.hashes = array('q', bytes(8 * size))
+        self.keys = [_EMPTY] * size
+        self.values = [None] * size
+
+    def _lookup(self, key):
+        h = hash(key)
+        mask = self.capacity - 1
+        i = h & mask
+        dist = 0
+        keys, hashes = self.keys, self.hashes
+        while True:
+            k = keys[i]
+            if k is _EMPTY:
+                return -1
+            if hashes[i] == h and (k is key or k == key):
+                return i
+            # Robin Hood: se o ocupante está mais perto de casa do que nós, a chave não existe
+            if ((i - hashes[i]) & mask) < dist:
+                return -1
+            i = (i + 1) & mask
+            dist += 1
+
+    def search(self, key):
+        i = self._lookup(key)
+        return self.values[i] if i >= 0 else None
+
+    def insert(self, key, value):
+        if self.size + 1 > self.max_load_factor * self.capacity:
+            self._resize(self.capacity * 2)
+        self._place(hash(key), key, value)
+
+    def _place(self, h, key, value):
+        mask = self.capacity - 1
+        keys, hashes, values = self.keys, self.hashes, self.values
+        i = h & mask
+        dist = 0
+        swapped = False
+        while True:
+            k = keys[i]
+            if k is _EMPTY:
+                hashes[i], keys[i], values[i] = h, key, value
+                self.size += 1
+                return
+            if not swapped and hashes[i] == h and (k is key or k == key):
+                values[i] = value  # Atualização de chave existente
+                return
+            existing = (i - hashes[i]) & mask
+            if existing < dist:
+                # Toma o lugar do mais "rico" e segue inserindo o deslocado
+                hashes[i], h = h, hashes[i]
+                keys[i], key = key, k
+                values[i], value = value, values[i]
+                dist = existing
+                swapped = True
+            i = (i + 1) & mask
+            dist += 1
+
+    def remove(self, key):
+        i = self._lookup(key)
+        if i < 0:
+            return
+        mask = self.capacity - 1
+        keys, hashes, values = self.keys, self.hashes, self.values
+        # Backward shift: puxa uma posição para trás quem estiver fora do bucket ideal
+        j = (i + 1) & mask
+        while keys[j] is not _EMPTY and ((j - hashes[j]) & mask) > 0:
+            hashes[i], keys[i], values[i] = hashes[j], keys[j], values[j]
+            i = j
+            j = (j + 1) & mask
+        keys[i] = _EMPTY
+        values[i] = None
+        self.size -= 1
+
+    def _resize(self, new_capacity):
+        old = zip(self.hashes, self.keys, self.values)
+        self.capacity = new_capacity
+        self.hashes = array('q', bytes(8 * new_capacity))
+        self.keys = [_EMPTY] * new_capacity
+        self.values = [None] * new_capacity
+        self.size = 0
+        for h, key, value in old:
+            if key is not _EMPTY:
+                self._place(h, key, value)
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        for key, value in zip(self.keys, self.values):
+            if key is not _EMPTY:
+                yield key, value
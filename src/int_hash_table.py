@@ -0,0 +1,142 @@
+import numpy as np
+
+_EMPTY, _FULL, _DELETED = 0, 1, 2
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)  # Constante do hashing multiplicativo (Fibonacci)
+
+
+class IntHashTable:
+    """
+    Tabela hash para chaves inteiras (int64) guardada em arrays NumPy, com
+    endereçamento aberto e sondagem linear. As operações em lote
+    (insert_many/search_many/remove_many) processam todas as chaves juntas:
+    cada rodada de sondagem é uma única operação vetorizada, e o número de
+    rodadas é o maior comprimento de sondagem do lote, não o número de chaves.
+    Remoções deixam lápides, descartadas no próximo redimensionamento.
+    """
+    def __init__(self, capacity=1024, max_load_factor=0.5, value_dtype=np.int64):
+        bits = max(1, int(capacity - 1).bit_length())
+        self.max_load_factor = max_load_factor
+        self.value_dtype = np.dtype(value_dtype)
+        self.size = 0
+        self._deleted = 0
+        self._allocate(bits)
+
+    def _allocate(self, bits):
+        self._bits = bits
+        self.capacity = 1 << bits
+        self.keys = np.zeros(self.capacity, dtype=np.int64)
+        self.values = np.zeros(self.capacity, dtype=self.value_dtype)
+        self.state = np.zeros(self.capacity, dtype=np.uint8)
+
+    def _hash(self, keys):
+        # Hash multiplicativo: os bits altos do produto viram o índice do bucket
+        with np.errstate(over='ignore'):
+            mixed = keys.astype(np.uint64) * _GOLDEN
+        return (mixed >> np.uint64(64 - self._bits)).astype(np.int64)
+
+    def __len__(self):
+        return self.size
+
+    # Operações em lote
+    def search_many(self, keys):
+        """Devolve (valores, encontrados): valores[i] só é válido onde encontrados[i] é True."""
+        keys = np.asarray(keys, dtype=np.int64)
+        slots = self._find(keys)
+        found = slots >= 0
+        values = np.zeros(len(keys), dtype=self.value_dtype)
+        values[found] = self.values[slots[found]]
+        return values, found
+
+    def insert_many(self, keys, values):
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=self.value_dtype)
+        if keys.shape != values.shape:
+            raise ValueError("keys e values precisam ter o mesmo tamanho")
+        # Chaves repetidas no lote: vale a última ocorrência
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - last
+        keys, values = keys[keep], values[keep]
+
+        # 1. Atualiza as que já existem
+        slots = self._find(keys)
+        found = slots >= 0
+        self.values[slots[found]] = values[found]
+        keys, values = keys[~found], values[~found]
+        if not len(keys):
+            return
+
+        # 2. Insere as novas (redimensionando antes, se preciso)
+        if self.size + self._deleted + len(keys) > self.max_load_factor * self.capacity:
+            self._resize(self.size + len(keys))
+        self._insert_new(keys, values)
+
+    def remove_many(self, keys):
+        """Remove as chaves presentes; devolve quantas foram removidas."""
+        keys = np.unique(np.asarray(keys, dtype=np.int64))
+        slots = self._find(keys)
+        slots = slots[slots >= 0]
+        self.state[slots] = _DELETED
+        self.size -= len(slots)
+        self._deleted += len(slots)
+        return len(slots)
+
+    # Operações individuais (mesma API da HashTable)
+    def insert(self, key, value):
+        self.insert_many([key], [value])
+
+    def search(self, key):
+        values, found = self.search_many([key])
+        return values[0].item() if found[0] else None
+
+    def remove(self, key):
+        self.remove_many([key])
+
+    def _find(self, keys):
+        # Sondagem vetorizada: a cada rodada, todas as chaves ainda ativas avançam um slot
+        mask = self.capacity - 1
+        slots = np.full(len(keys), -1, dtype=np.int64)
+        pos = self._hash(keys)
+        active = np.arange(len(keys))
+        while len(active):
+            state = self.state[pos]
+            hit = (state == _FULL) & (self.keys[pos] == keys[active])
+            slots[active[hit]] = pos[hit]
+            # Continua quem não achou e ainda não encontrou um slot vazio
+            more = ~hit & (state != _EMPTY)
+            active = active[more]
+            pos = (pos[more] + 1) & mask
+        return slots
+
+    def _insert_new(self, keys, values):
+        # Chaves garantidamente ausentes. Várias podem disputar o mesmo slot livre na
+        # mesma rodada: a primeira de cada slot vence e as demais seguem sondando.
+        mask = self.capacity - 1
+        pos = self._hash(keys)
+        active = np.arange(len(keys))
+        while len(active):
+            free = self.state[pos] != _FULL
+            candidates = np.flatnonzero(free)
+            _, first = np.unique(pos[candidates], return_index=True)
+            winners = candidates[first]
+            slots = pos[winners]
+            self._deleted -= int(np.count_nonzero(self.state[slots] == _DELETED))
+            self.keys[slots] = keys[active[winners]]
+            self.values[slots] = values[active[winners]]
+            self.state[slots] = _FULL
+            self.size += len(winners)
+
+            placed = np.zeros(len(active), dtype=bool)
+            placed[winners] = True
+            active = active[~placed]
+            pos = (pos[~placed] + 1) & mask
+
+    def _resize(self, needed):
+        live = self.state == _FULL
+        keys, values = self.keys[live], self.values[live]
+        bits = self._bits
+        while needed > self.max_load_factor * (1 << bits):
+            bits += 1
+        self._allocate(bits)
+        self.size = 0
+        self._deleted = 0
+        self._insert_new(keys, values)
@@ -0,0 +1,179 @@
+import hashlib
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+
+_EMPTY, _FULL = 0, 1
+_COUNT = struct.Struct("<q")  # Cabeçalho de cada shard: número de entradas
+
+
+class SharedHashTable:
+    """
+    Tabela hash dividida em shards, cada um em um segmento de
+    multiprocessing.shared_memory, para ser compartilhada por vários processos
+    sem cópia. A chave escolhe o shard pelo hash; cada shard tem o seu Lock,
+    então processos que mexem em shards diferentes não se bloqueiam.
+
+    Os slots têm largura fixa, descrita por formatos do módulo struct:
+    'q' (int64), 'd' (float64) ou 'Np' (bytes de até N-1 bytes), por exemplo.
+    Cada shard usa endereçamento aberto com sondagem linear e remoção por
+    backward shift (sem lápides, então inserções e remoções alternadas não
+    degradam as buscas), e tem capacidade fixa (não há redimensionamento
+    entre processos).
+
+    Para usar em outros processos, passe o objeto como argumento do Process
+    (ou do initializer do Pool): ele se reconecta aos segmentos pelo nome.
+    Quem criou a tabela deve chamar unlink() no fim. Os locks são criados em
+    mp_context (um multiprocessing.get_context(...)), que deve ser o mesmo dos
+    processos que vão usar a tabela.
+    """
+    def __init__(self, shards=4, slots_per_shard=1 << 14, key_format="q", value_format="q",
+                 max_load_factor=0.9, mp_context=None):
+        slots = 1
+        while slots < slots_per_shard:
+            slots *= 2
+        self.shards = shards
+        self.slots_per_shard = slots
+        self.key_format = key_format
+        self.value_format = value_format
+        self.max_load_factor = max_load_factor
+        self._setup_structs()
+        ctx = mp_context if mp_context is not None else multiprocessing
+        self._locks = [ctx.Lock() for _ in range(shards)]
+        size = _COUNT.size + slots * self._slot.size
+        self._segments = [shared_memory.SharedMemory(create=True, size=size) for _ in range(shards)]
+        for segment in self._segments:
+            segment.buf[:size] = bytes(size)
+        self._owner = True
+
+    def _setup_structs(self):
+        self._slot = struct.Struct("<B" + self.key_format + self.value_format)
+        self._key = struct.Struct("<" + self.key_format)
+        self._value_offset = 1 + self._key.size
+        self._value = struct.Struct("<" + self.value_format)
+        self._key_limit = int(self.key_format[:-1]) - 1 if self.key_format.endswith("p") else None
+
+    # Transporte entre processos: só os nomes dos segmentos e os locks
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_segments"] = [segment.name for segment in self._segments]
+        for name in ("_slot", "_key", "_value"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        names = state.pop("_segments")
+        self.__dict__.update(state)
+        self._setup_structs()
+        # Os processos filhos compartilham o resource_tracker do criador, então
+        # reconectar não faz o segmento ser apagado quando o filho termina
+        self._segments = [shared_memory.SharedMemory(name=name) for name in names]
+        self._owner = False
+
+    def _locate(self, key):
+        return self._hash(self._key.pack(key))
+
+    def _hash(self, packed):
+        # hash() varia entre processos (PYTHONHASHSEED); blake2b é estável
+        h = int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little")
+        return h % self.shards, (h >> 16) & (self.slots_per_shard - 1)
+
+    def _check_key(self, key):
+        if self._key_limit is not None and len(key) > self._key_limit:
+            raise ValueError(f"Chave com {len(key)} bytes; o limite é {self._key_limit}")
+
+    def _probe(self, buf, start, key):
+        # Devolve (slot da chave ou -1, primeiro slot livre ou -1)
+        mask = self.slots_per_shard - 1
+        width = self._slot.size
+        slot = start
+        for _ in range(self.slots_per_shard):
+            offset = _COUNT.size + slot * width
+            if buf[offset] == _EMPTY:
+                return -1, slot
+            if self._key.unpack_from(buf, offset + 1)[0] == key:
+                return slot, -1
+            slot = (slot + 1) & mask
+        return -1, -1
+
+    def insert(self, key, value):
+        self._check_key(key)
+        shard, start = self._locate(key)
+        buf = self._segments[shard].buf
+        with self._locks[shard]:
+            slot, free = self._probe(buf, start, key)
+            if slot >= 0:
+                self._value.pack_into(buf, _COUNT.size + slot * self._slot.size + self._value_offset, value)
+                return
+            count = _COUNT.unpack_from(buf, 0)[0]
+            if free < 0 or count + 1 > self.max_load_factor * self.slots_per_shard:
+                raise MemoryError(f"Shard {shard} cheio ({count} entradas)")
+            self._slot.pack_into(buf, _COUNT.size + free * self._slot.size, _FULL, key, value)
+            _COUNT.pack_into(buf, 0, count + 1)
+
+    def search(self, key):
+        self._check_key(key)
+        shard, start = self._locate(key)
+        buf = self._segments[shard].buf
+        with self._locks[shard]:
+            slot, _ = self._probe(buf, start, key)
+            if slot < 0:
+                return None
+            return self._value.unpack_from(buf, _COUNT.size + slot * self._slot.size + self._value_offset)[0]
+
+    def remove(self, key):
+        self._check_key(key)
+        shard, start = self._locate(key)
+        buf = self._segments[shard].buf
+        with self._locks[shard]:
+            slot, _ = self._probe(buf, start, key)
+            if slot < 0:
+                return
+            self._backward_shift(buf, slot)
+            _COUNT.pack_into(buf, 0, _COUNT.unpack_from(buf, 0)[0] - 1)
+
+    def _backward_shift(self, buf, hole):
+        # Puxa para o buraco cada entrada seguinte cuja sondagem passa por ele
+        # (a distância da sua posição ideal até ela cobre o buraco), até um slot vazio
+        mask = self.slots_per_shard - 1
+        width = self._slot.size
+        key_size = self._key.size
+        slot = hole
+        for _ in range(self.slots_per_shard - 1):
+            slot = (slot + 1) & mask
+            offset = _COUNT.size + slot * width
+            if buf[offset] == _EMPTY:
+                break
+            _, home = self._hash(bytes(buf[offset + 1:offset + 1 + key_size]))
+            if (slot - home) & mask >= (slot - hole) & mask:
+                hole_offset = _COUNT.size + hole * width
+                buf[hole_offset:hole_offset + width] = buf[offset:offset + width]
+                hole = slot
+        buf[_COUNT.size + hole * width] = _EMPTY
+
+    def __len__(self):
+        total = 0
+        for shard, segment in enumerate(self._segments):
+            with self._locks[shard]:
+                total += _COUNT.unpack_from(segment.buf, 0)[0]
+        return total
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+
+    def unlink(self):
+        """Fecha e apaga os segmentos (apenas no processo que criou a tabela)."""
+        self.close()
+        if self._owner:
+            for segment in self._segments:
+                segment.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
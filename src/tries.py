@@ -1,22 +1,67 @@
+import heapq
+import mmap
+import multiprocessing
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import islice
+from types import MappingProxyType
+
+# Compartilhados por todos os nós sem filhos / sem completações: o dict e a lista
+# só são criados quando o nó recebe o primeiro filho ou a primeira completação
+_NO_CHILDREN = MappingProxyType({})
+_NO_TOP = ()
+
 class TrieNode:
+    __slots__ = ("children", "is_end_of_word", "weight", "top")
+
     def __init__(self):
-        self.children = {}
+        self.children = _NO_CHILDREN
         self.is_end_of_word = False
+        self.weight = 0
+        self.top = _NO_TOP  # Melhores completações da subárvore: (-peso, palavra), em ordem
 
     def __str__(self):
         return f"Node(end={self.is_end_of_word}, children={list(self.children.keys())})"
 
+    # pickle/deepcopy: o mappingproxy compartilhado não é serializável, então
+    # viaja como None e volta a ser o mesmo _NO_CHILDREN ao carregar
+    def __getstate__(self):
+        children = None if self.children is _NO_CHILDREN else self.children
+        return children, self.is_end_of_word, self.weight, self.top
+
+    def __setstate__(self, state):
+        children, self.is_end_of_word, self.weight, self.top = state
+        self.children = _NO_CHILDREN if children is None else children
+
 class Trie:
-    def __init__(self):
+    def __init__(self, top_k=10):
         self.root = TrieNode()
+        self.top_k = top_k  # Tamanho da lista de melhores completações guardada em cada nó
 
-    def insert(self, word):
+    def insert(self, word, weight=0):
         node = self.root
+        path = [node]
         for char in word:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+            child = node.children.get(char)
+            if child is None:
+                if node.children is _NO_CHILDREN:
+                    node.children = {}
+                child = node.children[char] = TrieNode()
+            node = child
+            path.append(node)
+        existed, old_weight = node.is_end_of_word, node.weight
         node.is_end_of_word = True
+        node.weight = weight
+        if not existed:
+            # Palavra nova: basta oferecê-la à lista de cada ancestral
+            entry = (-weight, word)
+            for ancestor in path:
+                _offer(ancestor, entry, self.top_k)
+        elif old_weight != weight:
+            self._refresh_top(path, word)
 
     def search(self, word):
         """Retorna True apenas se a palavra exata existir."""
@@ -37,42 +82,485 @@ class Trie:
         return True
 
     def remove(self, word):
-        self._remove(self.root, word, 0)
+        # Iterativo: guarda o caminho e depois poda de baixo para cima
+        node = self.root
+        path = [node]
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return # Palavra não existe
+            path.append(node)
+        if not node.is_end_of_word:
+            return
+        node.is_end_of_word = False
 
-    def _remove(self, node, word, index):
-        # Caso base: chegamos ao fim da palavra
-        if index == len(word):
-            if not node.is_end_of_word:
-                return False # Palavra não existe
-            
-            node.is_end_of_word = False
-            # Se não tem filhos, este nó pode ser deletado pelo pai
-            return len(node.children) == 0
+        # Remove os nós que ficaram sem filhos e sem palavra
+        depth = len(word)
+        while depth > 0 and not path[depth].children and not path[depth].is_end_of_word:
+            parent = path[depth - 1]
+            del parent.children[word[depth - 1]]
+            if not parent.children:
+                parent.children = _NO_CHILDREN
+            depth -= 1
+        # Recalcula as listas no que sobrou do caminho
+        self._refresh_top(path[:depth + 1], word)
 
-        char = word[index]
-        if char not in node.children:
-            return False
+    def _refresh_top(self, path, word):
+        # De baixo para cima: cada nó junta a própria palavra com as listas dos filhos
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            own = (-node.weight, word[:depth]) if node.is_end_of_word else None
+            node.top = _merge_top(own, node.children.values(), self.top_k)
+
+    def complete(self, prefix, k=10):
+        """As k palavras de maior peso que começam com o prefixo (empates em ordem alfabética)."""
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if k <= self.top_k:
+            return [word for _, word in node.top[:k]]
+        # Mais do que o cache guarda: percorre a subárvore
+        entries = ((-end.weight, word) for end, word in _iter_words(node, prefix, lambda n: n.is_end_of_word))
+        return [word for _, word in heapq.nsmallest(k, entries)]
 
-        child_node = node.children[char]
-        should_remove_child = self._remove(child_node, word, index + 1)
+    def fuzzy_search(self, query, max_dist):
+        """
+        Gera (palavra, distância) para as palavras a até max_dist edições
+        (Levenshtein) de query, em ordem lexicográfica. Cada nó carrega a linha da
+        programação dinâmica do seu prefixo; um ramo é podado assim que o menor
+        valor da linha passa de max_dist.
+        """
+        stack = [(self.root, "", list(range(len(query) + 1)))]
+        while stack:
+            node, word, row = stack.pop()
+            if node.is_end_of_word and row[-1] <= max_dist:
+                yield word, row[-1]
+            for char, child in sorted(node.children.items(), reverse=True):
+                next_row = _levenshtein_row(row, char, query)
+                if min(next_row) <= max_dist:
+                    stack.append((child, word + char, next_row))
 
-        if should_remove_child:
-            del node.children[char]
-            return len(node.children) == 0 and not node.is_end_of_word
-        
-        return False
+    def freeze(self):
+        """Compila a Trie em uma FrozenTrie (somente leitura, em arrays)."""
+        return FrozenTrie.from_trie(self)
+
+    @classmethod
+    def from_frozen(cls, frozen, top_k=10):
+        """
+        Recria uma Trie mutável a partir de uma FrozenTrie (o inverso de freeze()).
+        A FrozenTrie não guarda pesos: as palavras voltam com peso 0.
+        """
+        trie = cls(top_k)
+        labels, first_child = frozen.labels, frozen.first_child
+        # Em ordem de nível: o nó 0 é a raiz e os filhos do nó i são os nós
+        # first_child[i]..first_child[i+1]-1, já em ordem de caractere
+        nodes = [trie.root]
+        nodes.extend(TrieNode() for _ in range(len(labels) - 1))
+        for i, node in enumerate(nodes):
+            lo, hi = first_child[i], first_child[i + 1]
+            if hi - lo == 1:
+                node.children = {chr(labels[lo]): nodes[lo]}
+            elif lo < hi:
+                node.children = dict(zip(map(chr, labels[lo:hi]), nodes[lo:hi]))
+            if frozen._is_terminal(i):
+                node.is_end_of_word = True
+        trie._rebuild_top()
+        return trie
+
+    @classmethod
+    def build_parallel(cls, words, processes=None, top_k=10, mp_context=None):
+        """
+        Monta a Trie com FrozenTrie.build_parallel e a recria como TrieNodes
+        (from_frozen). O resultado é igual ao de inserir as palavras uma a uma com
+        peso 0. Só a montagem é paralela: recriar os nós é serial e custa quase
+        tanto quanto inserir, então, se a Trie não vai mudar, use direto a
+        FrozenTrie de FrozenTrie.build_parallel (somente leitura, sem essa etapa).
+        """
+        return cls.from_frozen(FrozenTrie.build_parallel(words, processes, mp_context), top_k)
+
+    def _rebuild_top(self):
+        if not self.top_k:
+            return
+        # Pré-ordem invertida: os filhos são calculados antes dos pais
+        order = [(self.root, "")]
+        for node, word in order:
+            for char, child in node.children.items():
+                order.append((child, word + char))
+        for node, word in reversed(order):
+            own = (-node.weight, word) if node.is_end_of_word else None
+            if own is None and len(node.children) == 1:
+                # Caminho sem bifurcação (o caso mais comum): a mesma tupla do filho
+                (child,) = node.children.values()
+                node.top = child.top
+            else:
+                node.top = _merge_top(own, node.children.values(), self.top_k)
+
+    def words_with_prefix(self, prefix=""):
+        """Gera, em ordem lexicográfica, as palavras que começam com o prefixo."""
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return
+        for _, word in _iter_words(node, prefix, lambda n: n.is_end_of_word):
+            yield word
+
+    def __iter__(self):
+        return self.words_with_prefix("")
+
+    def __contains__(self, word):
+        return self.search(word)
+
+    def memory_usage(self):
+        """
+        Bytes ocupados pelos nós (sys.getsizeof), separados em nós, dicts de filhos
+        e completações. O dict vazio dos nós sem filhos não conta, e tuplas de
+        completações compartilhadas entre nós contam uma única vez.
+        """
+        nodes = leaves = words = 0
+        node_bytes = children_bytes = top_bytes = 0
+        seen = set()
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            words += node.is_end_of_word
+            node_bytes += sys.getsizeof(node)
+            if node.children is _NO_CHILDREN:
+                leaves += 1
+            else:
+                children_bytes += sys.getsizeof(node.children)
+                stack.extend(node.children.values())
+            for part in (node.top, *node.top):
+                if part is not _NO_TOP and id(part) not in seen:
+                    seen.add(id(part))
+                    top_bytes += sys.getsizeof(part)
+        total = node_bytes + children_bytes + top_bytes
+        return {
+            "nodes": nodes,
+            "leaves": leaves,
+            "words": words,
+            "node_bytes": node_bytes,
+            "children_bytes": children_bytes,
+            "top_bytes": top_bytes,
+            "total_bytes": total,
+            "bytes_per_node": total / nodes,
+        }
 
     def print_all_words(self):
         print("\n--- Palavras na Trie ---")
-        self._print_recursive(self.root, "")
+        for word in self:
+            print(f"- {word}")
         print("------------------------")
 
-    def _print_recursive(self, node, current_word):
-        if node.is_end_of_word:
-            print(f"- {current_word}")
-        
-        for char, child_node in sorted(node.children.items()):
-            self._print_recursive(child_node, current_word + char)
+
+_FROZEN_MAGIC = b"FTR1"
+# magic, marcador de ordem dos bytes, nº de nós, nº de palavras
+_FROZEN_HEADER = struct.Struct("=4sIQQ")
+_BYTE_ORDER_MARK = 0x01020304
+
+
+class FrozenTrie:
+    """
+    Trie somente leitura guardada em três arrays, com os nós numerados em ordem
+    de nível (BFS), como no LOUDS:
+    - labels[i]: código do caractere da aresta que chega ao nó i (uint32);
+    - first_child[i]..first_child[i+1]-1: filhos do nó i, contíguos e ordenados
+      por caractere (a busca de um filho é uma busca binária);
+    - terminal: bitset dos nós que terminam uma palavra.
+    São ~8 bytes e 1 bit por nó, contra um TrieNode + dict por caractere.
+    save()/load() usam o mesmo layout em disco; load() mapeia o arquivo com mmap
+    e usa os arrays direto do mapeamento, sem desserializar nada.
+    """
+    def __init__(self, labels, first_child, terminal, n_words, mapping=None):
+        self.labels = labels
+        self.first_child = first_child
+        self.terminal = terminal
+        self.n_words = n_words
+        self._mapping = mapping
+
+    @classmethod
+    def from_words(cls, words):
+        """Monta direto das palavras (sem criar TrieNodes), nível a nível."""
+        words = sorted(set(words))
+        labels = array('I', [0])
+        first_child = array('I')
+        terminal = bytearray()
+        # Cada nó é um intervalo [lo, hi) das palavras ordenadas com o mesmo prefixo de tamanho 'depth'
+        queue = deque([(0, len(words), 0)])
+        node = 0
+        while queue:
+            lo, hi, depth = queue.popleft()
+            first_child.append(len(labels))
+            if lo < hi and len(words[lo]) == depth:
+                _set_bit(terminal, node)
+                lo += 1  # Ordenadas: a palavra que termina aqui é a primeira do intervalo
+            while lo < hi:
+                char = words[lo][depth]
+                end = lo + 1
+                while end < hi and words[end][depth] == char:
+                    end += 1
+                labels.append(ord(char))
+                queue.append((lo, end, depth + 1))
+                lo = end
+            node += 1
+        first_child.append(len(labels))
+        return cls(labels, first_child, terminal, len(words))
+
+    @classmethod
+    def build_parallel(cls, words, processes=None, mp_context=None):
+        """
+        Igual a from_words, montada em paralelo. As palavras são separadas pelo
+        primeiro caractere, cada grupo vira uma FrozenTrie em um processo do pool,
+        e as partes são intercaladas nível a nível nos arrays finais. O processo
+        principal só copia fatias de arrays (nenhum nó vira objeto Python), então
+        o trabalho serial fica pequeno perto da montagem. processes=1 monta tudo
+        no próprio processo. O resultado é somente leitura (sem insert, remove ou
+        complete); Trie.build_parallel devolve uma Trie comum.
+        """
+        groups = {}
+        root_terminal = False
+        for word in words:
+            if word:
+                groups.setdefault(word[0], []).append(word)
+            else:
+                root_terminal = True  # A palavra vazia fica na raiz
+        # Os grupos maiores primeiro, para equilibrar a carga do pool
+        tasks = sorted(groups.values(), key=len, reverse=True)
+        if processes == 1:
+            results = list(map(_build_subtrie, tasks))
+        else:
+            ctx = mp_context if mp_context is not None else multiprocessing
+            with ctx.Pool(processes) as pool:
+                results = list(pool.imap_unordered(_build_subtrie, tasks))
+        parts = [cls(array('I', labels), array('I', first_child), terminal, n_words)
+                 for labels, first_child, terminal, n_words in results]
+        parts.sort(key=lambda part: part.labels[1])  # Pelo primeiro caractere
+        return cls._concat(parts, root_terminal)
+
+    @classmethod
+    def _concat(cls, parts, root_terminal):
+        # Cada parte tem uma raiz local (que some) com um único filho, o primeiro
+        # caractere. Em ordem de nível, o nível d do resultado é o nível d de cada
+        # parte, uma depois da outra: basta copiar as fatias e somar a first_child
+        # de cada fatia o deslocamento do início do nível seguinte da mesma parte.
+        bounds = []
+        for part in parts:
+            # bounds[d]: início do nível d + 1 da parte (o fim é o início do seguinte)
+            levels = [1]
+            while levels[-1] < len(part.labels):
+                levels.append(part.first_child[levels[-1]])
+            bounds.append(levels)
+        depth = max((len(levels) for levels in bounds), default=0)
+
+        def local(i, d):
+            levels = bounds[i]
+            if d + 1 < len(levels):
+                return levels[d], levels[d + 1]
+            return levels[-1], levels[-1]
+
+        # starts[i][d]: onde o nível d + 1 da parte i começa no resultado
+        starts = [[0] * (depth + 1) for _ in parts]
+        position = 1
+        for d in range(depth + 1):
+            for i in range(len(parts)):
+                starts[i][d] = position
+                lo, hi = local(i, d)
+                position += hi - lo
+        n_nodes = position
+
+        labels = array('I', [0])
+        first_child = array('I', [1])
+        terminal = int(root_terminal)
+        part_bits = [int.from_bytes(part.terminal, "little") for part in parts]
+        for d in range(depth):
+            for i, part in enumerate(parts):
+                lo, hi = local(i, d)
+                if lo == hi:
+                    continue
+                labels.extend(part.labels[lo:hi])
+                shift = starts[i][d + 1] - local(i, d + 1)[0]
+                first_child.extend(map(shift.__add__, part.first_child[lo:hi]))
+                # Bits [lo, hi) da parte vão para a posição do nível no resultado
+                terminal |= ((part_bits[i] >> lo) & ((1 << (hi - lo)) - 1)) << starts[i][d]
+        first_child.append(n_nodes)
+        terminal = bytearray(terminal.to_bytes((n_nodes + 7) // 8, "little"))
+        n_words = root_terminal + sum(part.n_words for part in parts)
+        return cls(labels, first_child, terminal, n_words)
+
+    @classmethod
+    def from_trie(cls, trie):
+        labels = array('I', [0])
+        first_child = array('I')
+        terminal = bytearray()
+        n_words = 0
+        queue = deque([trie.root])
+        node = 0
+        while queue:
+            current = queue.popleft()
+            first_child.append(len(labels))
+            if current.is_end_of_word:
+                _set_bit(terminal, node)
+                n_words += 1
+            for char, child in sorted(current.children.items()):
+                labels.append(ord(char))
+                queue.append(child)
+            node += 1
+        first_child.append(len(labels))
+        return cls(labels, first_child, terminal, n_words)
+
+    def _child(self, node, char):
+        lo, hi = self.first_child[node], self.first_child[node + 1]
+        code = ord(char)
+        i = bisect_left(self.labels, code, lo, hi)
+        return i if i < hi and self.labels[i] == code else -1
+
+    def _walk(self, prefix):
+        node = 0
+        for char in prefix:
+            node = self._child(node, char)
+            if node < 0:
+                return -1
+        return node
+
+    def _is_terminal(self, node):
+        byte = node >> 3
+        return byte < len(self.terminal) and (self.terminal[byte] >> (node & 7)) & 1 == 1
+
+    def search(self, word):
+        """Retorna True apenas se a palavra exata existir."""
+        node = self._walk(word)
+        return node >= 0 and self._is_terminal(node)
+
+    def starts_with(self, prefix):
+        """Retorna True se existe alguma palavra começando com o prefixo."""
+        return self._walk(prefix) >= 0
+
+    def words_with_prefix(self, prefix=""):
+        """Gera, em ordem lexicográfica, as palavras que começam com o prefixo."""
+        node = self._walk(prefix)
+        if node < 0:
+            return
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if self._is_terminal(node):
+                yield word
+            lo, hi = self.first_child[node], self.first_child[node + 1]
+            # Empilha do maior para o menor para visitar os filhos em ordem
+            for child in range(hi - 1, lo - 1, -1):
+                stack.append((child, word + chr(self.labels[child])))
+
+    def __iter__(self):
+        return self.words_with_prefix("")
+
+    def __contains__(self, word):
+        return self.search(word)
+
+    def __len__(self):
+        return self.n_words
+
+    def save(self, path):
+        n_nodes = len(self.labels)
+        terminal = bytes(self.terminal).ljust((n_nodes + 7) // 8, b"\0")
+        with open(path, "wb") as f:
+            f.write(_FROZEN_HEADER.pack(_FROZEN_MAGIC, _BYTE_ORDER_MARK, n_nodes, self.n_words))
+            f.write(self.labels.tobytes())
+            f.write(self.first_child.tobytes())
+            f.write(terminal)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        magic, mark, n_nodes, n_words = _FROZEN_HEADER.unpack_from(view)
+        if magic != _FROZEN_MAGIC or mark != _BYTE_ORDER_MARK:
+            view.release()
+            mapping.close()
+            raise ValueError(f"{path} não é uma FrozenTrie desta plataforma")
+        offset = _FROZEN_HEADER.size
+        labels = view[offset:offset + 4 * n_nodes].cast('I')
+        offset += 4 * n_nodes
+        first_child = view[offset:offset + 4 * (n_nodes + 1)].cast('I')
+        offset += 4 * (n_nodes + 1)
+        terminal = view[offset:offset + (n_nodes + 7) // 8]
+        return cls(labels, first_child, terminal, n_words, mapping=(mapping, view))
+
+    def close(self):
+        """Libera o mapeamento de uma FrozenTrie carregada com load()."""
+        if self._mapping is None:
+            return
+        mapping, view = self._mapping
+        for part in (self.labels, self.first_child, self.terminal, view):
+            part.release()
+        mapping.close()
+        self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _build_subtrie(words):
+    # Executada nos processos do pool: monta direto os arrays, sem TrieNodes
+    frozen = FrozenTrie.from_words(words)
+    return frozen.labels.tobytes(), frozen.first_child.tobytes(), bytes(frozen.terminal), frozen.n_words
+
+
+def _set_bit(bits, i):
+    byte = i >> 3
+    if byte >= len(bits):
+        bits.extend(bytes(byte + 1 - len(bits)))
+    bits[byte] |= 1 << (i & 7)
+
+
+def _common_length(label, key, start):
+    """Tamanho do prefixo comum entre label e key[start:], sem fatiar key."""
+    n = min(len(label), len(key) - start)
+    i = 0
+    while i < n and label[i] == key[start + i]:
+        i += 1
+    return i
+
+
+def _levenshtein_row(prev, char, query):
+    """Próxima linha da matriz de edição ao acrescentar 'char' ao prefixo."""
+    row = [prev[0] + 1]
+    for j, q in enumerate(query, 1):
+        row.append(min(row[j - 1] + 1, prev[j] + 1, prev[j - 1] + (q != char)))
+    return row
+
+
+def _offer(node, entry, k):
+    # As listas são tuplas imutáveis, então nós podem compartilhar a mesma
+    top = node.top
+    if len(top) < k or (k and entry < top[-1]):
+        i = bisect_left(top, entry)
+        node.top = (top[:i] + (entry,) + top[i:])[:k]
+
+
+def _merge_top(own, children, k):
+    """Junta a entrada do próprio nó com as listas (já ordenadas) dos filhos e fica com as k primeiras."""
+    lists = [child.top for child in children]
+    if own is not None:
+        lists.append([own])
+    return tuple(islice(heapq.merge(*lists), k))
+
+
+def _iter_words(node, prefix, is_word, label=lambda child, char: char):
+    # Gera (nó, palavra) das palavras da subárvore, em ordem, sem recursão
+    stack = [(node, prefix)]
+    while stack:
+        node, word = stack.pop()
+        if is_word(node):
+            yield node, word
+        for char, child in sorted(node.children.items(), reverse=True):
+            stack.append((child, word + label(child, char)))
 
 
 class PatriciaNode:
@@ -80,20 +568,188 @@ class PatriciaNode:
         self.label = label
         self.children = {}
         self.is_leaf = is_leaf
+        self.weight = 0
+        self.top = _NO_TOP  # Melhores completações da subárvore: (-peso, palavra), em ordem
 
 class PatriciaTrie:
-    def __init__(self):
+    def __init__(self, top_k=10):
         self.root = PatriciaNode("") # Raiz vazia
+        self.top_k = top_k  # Tamanho da lista de melhores completações guardada em cada nó
+        self.size = 0
 
-    def _get_common_prefix(self, s1, s2):
-        """Retorna o prefixo comum entre duas strings."""
-        min_len = min(len(s1), len(s2))
-        for i in range(min_len):
-            if s1[i] != s2[i]:
-                return s1[:i]
-        return s1[:min_len]
+    @classmethod
+    def from_sorted(cls, words, weights=None, top_k=10):
+        """
+        Monta a árvore em uma única passada sobre palavras já ordenadas (repetidas
+        são ignoradas), sem os splits da inserção: só o caminho mais à direita
+        (o da palavra anterior) pode mudar, e ele fica em uma pilha.
+        weights, se dado, é a sequência de pesos na mesma ordem das palavras.
+        """
+        trie = cls(top_k)
+        weights = iter(weights) if weights is not None else None
+        stack = [(trie.root, 0)]  # (nó, tamanho do prefixo que ele representa)
+        prev = None
+        for word in words:
+            weight = next(weights) if weights is not None else 0
+            if prev is not None and word <= prev:
+                if word == prev:
+                    continue
+                raise ValueError(f"Entrada fora de ordem: {word!r} depois de {prev!r}")
+            lcp = _common_length(prev, word, 0) if prev is not None else 0
+            # Sobe até o nó que contém o fim do prefixo comum
+            popped = None
+            while stack[-1][1] > lcp:
+                popped = stack.pop()[0]
+            parent, depth = stack[-1]
+            if depth < lcp:
+                # O prefixo comum termina no meio do rótulo de 'popped': divide
+                cut = lcp - depth
+                middle = PatriciaNode(popped.label[:cut])
+                popped.label = popped.label[cut:]
+                middle.children[popped.label[0]] = popped
+                parent.children[middle.label[0]] = middle
+                stack.append((middle, lcp))
+                parent = middle
+            if lcp == len(word):
+                parent.is_leaf = True  # Só a palavra vazia, primeira da lista
+                parent.weight = weight
+            else:
+                node = PatriciaNode(word[lcp:], True)
+                node.weight = weight
+                parent.children[word[lcp]] = node
+                stack.append((node, len(word)))
+            trie.size += 1
+            prev = word
+        trie._rebuild_top()
+        return trie
 
-    def insert(self, key):
+    def _rebuild_top(self):
+        # Pré-ordem invertida: os filhos são calculados antes dos pais
+        order = [(self.root, "")]
+        for node, word in order:
+            for child in node.children.values():
+                order.append((child, word + child.label))
+        for node, word in reversed(order):
+            own = (-node.weight, word) if node.is_leaf else None
+            node.top = _merge_top(own, node.children.values(), self.top_k)
+
+    def insert(self, key, weight=0):
+        if self._insert(key):
+            self.size += 1
+        path = self._path(key)
+        path[-1][0].weight = weight
+        self._refresh_top(path, key)
+
+    def _path(self, key):
+        """Nós do caminho da chave, com o tamanho do prefixo que cada um representa."""
+        node = self.root
+        i = 0
+        path = [(node, 0)]
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None or not key.startswith(child.label, i):
+                break
+            i += len(child.label)
+            node = child
+            path.append((node, i))
+        return path
+
+    def _refresh_top(self, path, key):
+        for node, depth in reversed(path):
+            own = (-node.weight, key[:depth]) if node.is_leaf else None
+            node.top = _merge_top(own, node.children.values(), self.top_k)
+
+    # Consultas: os rótulos são comparados no lugar (startswith com posição), sem fatiar a chave
+    def search(self, key):
+        """Retorna True apenas se a palavra exata existir."""
+        node = self.root
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None or not key.startswith(child.label, i):
+                return False
+            i += len(child.label)
+            node = child
+        return node.is_leaf
+
+    def starts_with(self, prefix):
+        """Retorna True se existe alguma palavra começando com o prefixo."""
+        node, _ = self._find_prefix(prefix)
+        return node is not None and (node.is_leaf or bool(node.children))
+
+    def _find_prefix(self, prefix):
+        """
+        Devolve o nó cuja subárvore tem as palavras que começam com o prefixo e a
+        palavra que esse nó representa, ou (None, None).
+        """
+        node = self.root
+        i = 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i])
+            if child is None:
+                return None, None
+            if prefix.startswith(child.label, i):
+                i += len(child.label)
+                node = child
+                continue
+            # O prefixo pode terminar no meio do rótulo
+            rest = len(prefix) - i
+            if rest < len(child.label) and _common_length(child.label, prefix, i) == rest:
+                return child, prefix + child.label[rest:]
+            return None, None
+        return node, prefix
+
+    def words_with_prefix(self, prefix=""):
+        """Gera, em ordem lexicográfica, as palavras que começam com o prefixo."""
+        node, word = self._find_prefix(prefix)
+        if node is None:
+            return
+        for _, w in _iter_words(node, word, lambda n: n.is_leaf, lambda child, char: child.label):
+            yield w
+
+    def __iter__(self):
+        return self.words_with_prefix("")
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def __len__(self):
+        return self.size
+
+    def fuzzy_search(self, query, max_dist):
+        """
+        Gera (palavra, distância) para as palavras a até max_dist edições
+        (Levenshtein) de query, em ordem lexicográfica. A linha da programação
+        dinâmica avança caractere a caractere pelo rótulo e o ramo é podado no
+        meio do rótulo se o menor valor passar de max_dist.
+        """
+        stack = [(self.root, "", list(range(len(query) + 1)))]
+        while stack:
+            node, word, row = stack.pop()
+            if node.is_leaf and row[-1] <= max_dist:
+                yield word, row[-1]
+            for _, child in sorted(node.children.items(), reverse=True):
+                next_row = row
+                for char in child.label:
+                    next_row = _levenshtein_row(next_row, char, query)
+                    if min(next_row) > max_dist:
+                        break
+                else:
+                    stack.append((child, word + child.label, next_row))
+
+    def complete(self, prefix, k=10):
+        """As k palavras de maior peso que começam com o prefixo (empates em ordem alfabética)."""
+        node, word = self._find_prefix(prefix)
+        if node is None:
+            return []
+        if k <= self.top_k:
+            return [w for _, w in node.top[:k]]
+        entries = ((-end.weight, w) for end, w in
+                   _iter_words(node, word, lambda n: n.is_leaf, lambda child, char: child.label))
+        return [w for _, w in heapq.nsmallest(k, entries)]
+
+    def _insert(self, key):
+        """Insere a chave; devolve True se ela ainda não existia."""
         node = self.root
         i = 0 
         
@@ -102,18 +758,19 @@ class PatriciaTrie:
             
             if char in node.children:
                 child = node.children[char]
-                common_prefix = self._get_common_prefix(child.label, key[i:])
-                common_len = len(common_prefix)
+                common_len = _common_length(child.label, key, i)
                 
                 # Caso 1: Split do nó existente
                 if common_len < len(child.label):
                     suffix_existing = child.label[common_len:]
                     suffix_new = key[i + common_len:]
                     
-                    child.label = common_prefix
+                    child.label = child.label[:common_len]
                     
                     new_child_existing = PatriciaNode(suffix_existing, child.is_leaf)
                     new_child_existing.children = child.children
+                    new_child_existing.weight = child.weight
+                    new_child_existing.top = child.top  # Mesma subárvore, mesmas completações
                     
                     child.children = {suffix_existing[0]: new_child_existing} if suffix_existing else {}
                     child.is_leaf = False 
@@ -123,7 +780,7 @@ class PatriciaTrie:
                         child.children[suffix_new[0]] = new_child_new
                     else:
                         child.is_leaf = True
-                    return
+                    return True
                 
                 # Caso 2: Descendo na árvore
                 i += common_len
@@ -132,12 +789,21 @@ class PatriciaTrie:
                 # Caso 3: Novo ramo
                 new_node = PatriciaNode(key[i:], True)
                 node.children[key[i]] = new_node
-                return
+                return True
         
+        added = not node.is_leaf
         node.is_leaf = True
+        return added
+
     def remove(self, key):
             """Remove uma chave da árvore, se existir."""
-            self._remove_node(self.root, key)
+            if not key and self.root.is_leaf:
+                self.root.is_leaf = False  # A palavra vazia fica marcada na própria raiz
+                self.size -= 1
+                self._refresh_top([(self.root, 0)], key)
+            elif self._remove_node(self.root, key):
+                self.size -= 1
+                self._refresh_top(self._path(key), key)
 
     def _remove_node(self, parent, key):
         if not key or not parent.children:
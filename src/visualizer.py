@@ -147,16 +147,44 @@ class TreeVisualizer:
 
         dot.node('buckets', bucket_label, width='1.0')
 
-        for i in range(hashtable.capacity):
-            curr = hashtable.table[i]
-            if curr:
-                prev_id = f"buckets:f{i}"
-                while curr:
-                    curr_id = str(id(curr))
-                    label = f"{{ {curr.key} | {curr.value} }}"
-                    dot.node(curr_id, label)
-                    dot.edge(prev_id, curr_id)
-                    prev_id = curr_id
-                    curr = curr.next
+        def add_chains(table, buckets_id):
+            for i, curr in enumerate(table):
+                if curr:
+                    prev_id = f"{buckets_id}:f{i}"
+                    while curr:
+                        curr_id = str(id(curr))
+                        label = f"{{ {curr.key} | {curr.value} }}"
+                        dot.node(curr_id, label)
+                        dot.edge(prev_id, curr_id)
+                        prev_id = curr_id
+                        curr = curr.next
+
+        add_chains(hashtable.table, 'buckets')
+
+        # Durante um rehash incremental, mostra também os buckets ainda não migrados
+        old_table = getattr(hashtable, '_old_table', None)
+        if old_table is not None:
+            old_label = "|".join(f"<f{i}> {i}" for i in range(len(old_table)))
+            dot.node('old_buckets', old_label, width='1.0', color='gray', fontcolor='gray')
+            add_chains(old_table, 'old_buckets')
+
+        return dot
+
+    def visualize_cache(self, cache):
+        # Uma linha por segmento (LRU, balde de frequência ou área da W-TinyLFU),
+        # do mais recente para o próximo a ser despejado
+        dot = graphviz.Digraph()
+        dot.attr(rankdir='LR')
+        dot.attr('node', shape='record')
+
+        for i, (name, segment) in enumerate(cache.segments()):
+            segment_id = f"segment{i}"
+            dot.node(segment_id, f"{name}\npeso {segment.weight}", shape='box', style='filled', fillcolor='#f0f0f0')
+            prev_id = segment_id
+            for node in segment:
+                node_id = str(id(node))
+                dot.node(node_id, f"{{ {node.key} | {node.value} }}")
+                dot.edge(prev_id, node_id)
+                prev_id = node_id
 
         return dot